@@ -0,0 +1,94 @@
+from typing import Callable, Optional
+
+from BaseClasses import CollectionState, MultiWorld
+
+# numpy is optional, without it every location's access_rule is called instead.
+# It's only imported once a batch is built, so processes that never generate don't pay for importing it.
+np = None
+_numpy_imported = False
+
+def _import_numpy():
+    global np, _numpy_imported
+    if not _numpy_imported:
+        _numpy_imported = True
+        try:
+            import numpy as np
+        except ImportError:
+            np = None
+    return np
+
+
+class BatchRulesEvaluator:
+    """Evaluates the access rules of many locations of one player against a single state at once.\n
+    The locations whose requires can be written as an OR of clauses of "count of key >= N" (see RequiresCompiler.dnf) are put in a
+    clause x key threshold matrix, so one numpy comparison against the state's counts tells which clauses are met,
+    and a reduce over each location's clauses tells which locations are. Every other location falls back to its access_rule,
+    so does every location if numpy isn't installed or if a location's rule was replaced after set_rules (eg. by a hook).
+    The rules are compared on every evaluate, a rule replaced after the batch was built rebuilds it with that location falling back."""
+    def __init__(self, multiworld: MultiWorld, player: int, location_clauses: dict[str, Optional[list[dict[str, int]]]],
+                 location_rules: dict[str, Callable[[CollectionState], bool]]):
+        self.multiworld = multiworld
+        self.player = player
+        self.location_clauses = location_clauses
+        # the rule each location had when its clauses were made, if it changes the clauses can't be trusted anymore
+        self.location_rules = location_rules
+        self.built = False
+
+    def build(self):
+        self.built = True
+        _import_numpy()
+        self.fallback_locations = []
+        self.never_met_locations = []
+        # the locations answered without calling their access_rule, with the rule their clauses were made from
+        self.batched_locations = []
+        vectorized = []
+
+        world = self.multiworld.worlds[self.player]
+        for location_name, clauses in self.location_clauses.items():
+            location = world.get_location(location_name)
+            if np is None or clauses is None or location.access_rule is not self.location_rules.get(location_name):
+                self.fallback_locations.append(location)
+            elif not clauses:
+                self.never_met_locations.append(location_name)
+                self.batched_locations.append((location, location.access_rule))
+            else:
+                vectorized.append((location_name, clauses))
+                self.batched_locations.append((location, location.access_rule))
+
+        self.keys = sorted({key for _, clauses in vectorized for clause in clauses for key in clause})
+        key_indexes = {key: i for i, key in enumerate(self.keys)}
+
+        self.location_names = [location_name for location_name, _ in vectorized]
+        if np is None or not vectorized:
+            return
+
+        clause_count = sum(len(clauses) for _, clauses in vectorized)
+        # a key missing from a clause needs a count of at least 0, which every count is
+        self.thresholds = np.zeros((clause_count, len(self.keys)), dtype=np.int64)
+        self.clause_starts = np.zeros(len(vectorized), dtype=np.intp)
+
+        row = 0
+        for i, (_, clauses) in enumerate(vectorized):
+            self.clause_starts[i] = row
+            for clause in clauses:
+                for key, count in clause.items():
+                    self.thresholds[row, key_indexes[key]] = count
+                row += 1
+
+    def evaluate(self, state: CollectionState) -> dict[str, bool]:
+        """Return the result of every location's access_rule for the state, by location name"""
+        if not self.built or any(location.access_rule is not rule for location, rule in self.batched_locations):
+            self.build()
+
+        results = {location_name: False for location_name in self.never_met_locations}
+
+        if self.location_names:
+            counts = np.fromiter((state.count(key, self.player) for key in self.keys), dtype=np.int64, count=len(self.keys))
+            clauses_met = (counts >= self.thresholds).all(axis=1)
+            locations_met = np.logical_or.reduceat(clauses_met, self.clause_starts)
+            results.update(zip(self.location_names, locations_met.tolist()))
+
+        for location in self.fallback_locations:
+            results[location.name] = bool(location.access_rule(state))
+
+        return results
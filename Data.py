@@ -2,6 +2,7 @@ import logging
 
 from .DataValidation import DataValidation, ValidationError
 from .Helpers import load_data_file as helpers_load_data_file
+from .DataBundle import data_bundle, BUNDLED_NAMES
 
 from .hooks.Data import \
     after_load_game_file, \
@@ -36,26 +37,31 @@ class ManualFile:
         return contents
 
 
-game_table = ManualFile('game.json', dict).load() #dict
-item_table = convert_to_list(ManualFile('items.json', list).load(), 'data') #list
-location_table = convert_to_list(ManualFile('locations.json', list).load(), 'data') #list
-region_table = ManualFile('regions.json', dict).load() #dict
-category_table = ManualFile('categories.json', dict).load() #dict
-option_table = ManualFile('options.json', dict).load() #dict
-meta_table = ManualFile('meta.json', dict).load() #dict
-
-# Removal of schemas in root of tables
-region_table.pop('$schema', '')
-category_table.pop('$schema', '')
-
-# hooks
-game_table = after_load_game_file(game_table)
-item_table = after_load_item_file(item_table)
-location_table = after_load_location_file(location_table)
-region_table = after_load_region_file(region_table)
-category_table = after_load_category_file(category_table)
-option_table = after_load_option_file(option_table)
-meta_table = after_load_meta_file(meta_table)
+if data_bundle is not None:
+    # the data files and hooks didn't change since the bundle was saved, so its tables are already loaded and processed
+    game_table, item_table, location_table, region_table, category_table, option_table, meta_table = \
+        (data_bundle["Data"][name] for name in BUNDLED_NAMES["Data"])
+else:
+    game_table = ManualFile('game.json', dict).load() #dict
+    item_table = convert_to_list(ManualFile('items.json', list).load(), 'data') #list
+    location_table = convert_to_list(ManualFile('locations.json', list).load(), 'data') #list
+    region_table = ManualFile('regions.json', dict).load() #dict
+    category_table = ManualFile('categories.json', dict).load() #dict
+    option_table = ManualFile('options.json', dict).load() #dict
+    meta_table = ManualFile('meta.json', dict).load() #dict
+
+    # Removal of schemas in root of tables
+    region_table.pop('$schema', '')
+    category_table.pop('$schema', '')
+
+    # hooks
+    game_table = after_load_game_file(game_table)
+    item_table = after_load_item_file(item_table)
+    location_table = after_load_location_file(location_table)
+    region_table = after_load_region_file(region_table)
+    category_table = after_load_category_file(category_table)
+    option_table = after_load_option_file(option_table)
+    meta_table = after_load_meta_file(meta_table)
 
 # seed all of the tables for validation
 DataValidation.game_table = game_table
@@ -65,15 +71,16 @@ DataValidation.region_table = region_table
 
 validation_errors = []
 
-# check that json files are not just invalid json
-try: DataValidation.checkForGameBeingInvalidJSON()
-except ValidationError as e: validation_errors.append(e)
+# check that json files are not just invalid json, a bundle is only saved once they passed
+if data_bundle is None:
+    try: DataValidation.checkForGameBeingInvalidJSON()
+    except ValidationError as e: validation_errors.append(e)
 
-try: DataValidation.checkForItemsBeingInvalidJSON()
-except ValidationError as e: validation_errors.append(e)
+    try: DataValidation.checkForItemsBeingInvalidJSON()
+    except ValidationError as e: validation_errors.append(e)
 
-try: DataValidation.checkForLocationsBeingInvalidJSON()
-except ValidationError as e: validation_errors.append(e)
+    try: DataValidation.checkForLocationsBeingInvalidJSON()
+    except ValidationError as e: validation_errors.append(e)
 
 
 ############
@@ -0,0 +1,95 @@
+import hashlib
+import logging
+import os
+import pickle
+import sys
+from importlib import resources
+from typing import Any, Optional
+
+import Utils
+
+# Set this environment variable to "0" to always run the whole data pipeline on import and never read or write the bundle
+BUNDLE_ENV_VAR = "MANUAL_DATA_BUNDLE"
+# Bump this whenever the names saved below or the way they are built changes
+BUNDLE_VERSION = 1
+
+# The module level names saved in the bundle, by module. They are all plain dicts/lists/sets or records so they can be pickled.
+# Everything is pickled at once so a record shared by several tables (eg. an item in item_table and item_name_to_item) stays shared.
+BUNDLED_NAMES: dict[str, tuple[str, ...]] = {
+    "Data": ("game_table", "item_table", "location_table", "region_table", "category_table", "option_table", "meta_table"),
+    "Items": ("item_id_to_name", "item_name_to_item", "item_name_groups", "_category_to_item_names", "advancement_item_names",
+              "lastItemId", "item_name_to_id", "category_state_keys", "item_name_to_category_keys",
+              "item_name_to_values"),
+    "Locations": ("location_families", "victory_names", "location_id_to_name", "location_name_to_location", "location_name_groups", "location_name_to_id"),
+}
+
+# The files the bundled tables are built from, any change to one of them makes the bundle outdated
+_HASHED_FOLDERS = ("data", "hooks")
+_HASHED_MODULES = ("Data.py", "Game.py", "Items.py", "Locations.py", "Helpers.py", "Records.py", "DataBundle.py")
+
+
+def is_bundle_enabled_by_env() -> bool:
+    return os.environ.get(BUNDLE_ENV_VAR, "") != "0"
+
+def get_bundle_path() -> str:
+    return Utils.cache_path("manual_data_bundles", f"{__package__}.pickle")
+
+def get_sources_hash() -> str:
+    """Hash of every data file, every hook and the modules processing them, along with the bundle format"""
+    package = resources.files(__package__)
+    sources = [package.joinpath(name) for name in _HASHED_MODULES]
+    for folder in _HASHED_FOLDERS:
+        sources.extend(sorted((file for file in package.joinpath(folder).iterdir() if file.is_file()), key=lambda file: file.name))
+
+    digest = hashlib.sha256(f"{BUNDLE_VERSION} {sys.version_info[:2]}".encode())
+    for source in sources:
+        if not source.is_file():
+            continue
+        digest.update(f"{source.parent.name}/{source.name}".encode())
+        digest.update(source.read_bytes())
+    return digest.hexdigest()
+
+def load_data_bundle() -> Optional[dict[str, dict[str, Any]]]:
+    """Return the tables saved by save_data_bundle if they were built from the current data and hooks, otherwise None"""
+    if not is_bundle_enabled_by_env():
+        return None
+
+    try:
+        with open(get_bundle_path(), "rb") as f:
+            bundle = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logging.debug(f"Manual: could not read the data bundle of {__package__}: {e}")
+        return None
+
+    if bundle.get("hash") != sources_hash:
+        return None
+    return bundle["tables"]
+
+def save_data_bundle():
+    """Save the processed tables of Data, Items and Locations so the next import can skip loading and processing the data files"""
+    if not is_bundle_enabled_by_env():
+        return
+
+    from . import Data, Items, Locations
+    if Data.validation_errors:
+        return
+
+    modules = {"Data": Data, "Items": Items, "Locations": Locations}
+    tables = {module_name: {name: getattr(modules[module_name], name) for name in names} for module_name, names in BUNDLED_NAMES.items()}
+
+    path = get_bundle_path()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f:
+            pickle.dump({"hash": sources_hash, "tables": tables}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+    except Exception as e:
+        logging.debug(f"Manual: could not save the data bundle of {__package__}: {e}")
+
+
+sources_hash = get_sources_hash() if is_bundle_enabled_by_env() else ""
+# The bundled tables by module then by name, None when the data has to be loaded and processed like usual
+data_bundle = load_data_bundle()
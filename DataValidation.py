@@ -17,6 +17,11 @@ class DataValidation():
 
     @staticmethod
     def checkItemNamesInLocationRequires():
+        from .Items import category_name_to_item_names
+        from .RequiresCompiler import parse_requires_list, RequiresCompileError
+
+        item_names = {item["name"] for item in DataValidation.item_table}
+
         for location in DataValidation.location_table:
             if "requires" not in location:
                 continue
@@ -37,7 +42,7 @@ class DataValidation():
                                 item_name = item_parts[0]
 
                             item_name = item_name[1:]
-                            item_category_exists = len([item for item in DataValidation.item_table if item_name in item.get('category', [])]) > 0
+                            item_category_exists = item_name in category_name_to_item_names
 
                             if not item_category_exists:
                                 raise ValidationError("Item category %s is required by location %s but is misspelled or does not exist." % (item_name, location["name"]))
@@ -52,45 +57,28 @@ class DataValidation():
                         if len(item_parts) > 1:
                             item_name = item_parts[0]
 
-                        item_exists = len([item["name"] for item in DataValidation.item_table if item["name"] == item_name]) > 0
+                        item_exists = item_name in item_names
 
                         if not item_exists:
                             raise ValidationError("Item %s is required by location %s but is misspelled or does not exist." % (item_name, location["name"]))
 
-            else:  # item access is in dict form
-                for item in location["requires"]:
-                    # if the require entry is an object with "or" or a list of items, treat it as a standalone require of its own
-                    if (isinstance(item, dict) and "or" in item and isinstance(item["or"], list)) or (isinstance(item, list)):
-                        or_items = item
-
-                        if isinstance(item, dict):
-                            or_items = item["or"]
-
-                        for or_item in or_items:
-                            or_item_parts = or_item.split(":")
-                            or_item_name = or_item
-
-                            if len(or_item_parts) > 1:
-                                or_item_name = or_item_parts[0]
-
-                            item_exists = len([item["name"] for item in DataValidation.item_table if item["name"] == or_item_name]) > 0
-
-                            if not item_exists:
-                                raise ValidationError("Item %s is required by location %s but is misspelled or does not exist." % (or_item_name, location["name"]))
-                    else:
-                        item_parts = item.split(":")
-                        item_name = item
-
-                        if len(item_parts) > 1:
-                            item_name = item_parts[0]
+            else:  # item access is in dict form, read the same way as the rules do
+                try:
+                    groups, items = parse_requires_list(location["requires"])
+                except RequiresCompileError as e:
+                    raise ValidationError("The requires of location %s are invalid: %s" % (location["name"], e))
 
-                        item_exists = len([item["name"] for item in DataValidation.item_table if item["name"] == item_name]) > 0
-
-                        if not item_exists:
-                            raise ValidationError("Item %s is required by location %s but is misspelled or does not exist." % (item_name, location["name"]))
+                for item_name, _ in [item for group in groups for item in group] + list(items):
+                    if item_name not in item_names:
+                        raise ValidationError("Item %s is required by location %s but is misspelled or does not exist." % (item_name, location["name"]))
 
     @staticmethod
     def checkItemNamesInRegionRequires():
+        from .Items import category_name_to_item_names
+        from .RequiresCompiler import parse_requires_list, RequiresCompileError
+
+        item_names = {item["name"] for item in DataValidation.item_table}
+
         for region_name in DataValidation.region_table:
             region = DataValidation.region_table[region_name]
 
@@ -113,7 +101,7 @@ class DataValidation():
                                 item_name = item_parts[0]
 
                             item_name = item_name[1:]
-                            item_category_exists = len([item for item in DataValidation.item_table if item_name in item.get('category', [])]) > 0
+                            item_category_exists = item_name in category_name_to_item_names
 
                             if not item_category_exists:
                                 raise ValidationError("Item category %s is required by region %s but is misspelled or does not exist." % (item_name, region_name))
@@ -128,42 +116,20 @@ class DataValidation():
                         if len(item_parts) > 1:
                             item_name = item_parts[0]
 
-                        item_exists = len([item["name"] for item in DataValidation.item_table if item["name"] == item_name]) > 0
+                        item_exists = item_name in item_names
 
                         if not item_exists:
                             raise ValidationError("Item %s is required by region %s but is misspelled or does not exist." % (item_name, region_name))
 
-            else:  # item access is in dict form
-                for item in region["requires"]:
-                    # if the require entry is an object with "or" or a list of items, treat it as a standalone require of its own
-                    if (isinstance(item, dict) and "or" in item and isinstance(item["or"], list)) or (isinstance(item, list)):
-                        or_items = item
+            else:  # item access is in dict form, read the same way as the rules do
+                try:
+                    groups, items = parse_requires_list(region["requires"])
+                except RequiresCompileError as e:
+                    raise ValidationError("The requires of region %s are invalid: %s" % (region_name, e))
 
-                        if isinstance(item, dict):
-                            or_items = item["or"]
-
-                        for or_item in or_items:
-                            or_item_parts = or_item.split(":")
-                            or_item_name = or_item
-
-                            if len(or_item_parts) > 1:
-                                or_item_name = or_item_parts[0]
-
-                            item_exists = len([item["name"] for item in DataValidation.item_table if item["name"] == or_item_name]) > 0
-
-                            if not item_exists:
-                                raise ValidationError("Item %s is required by region %s but is misspelled or does not exist." % (or_item_name, region_name))
-                    else:
-                        item_parts = item.split(":")
-                        item_name = item
-
-                        if len(item_parts) > 1:
-                            item_name = item_parts[0]
-
-                        item_exists = len([item["name"] for item in DataValidation.item_table if item["name"] == item_name]) > 0
-
-                        if not item_exists:
-                            raise ValidationError("Item %s is required by region %s but is misspelled or does not exist." % (item_name, region_name))
+                for item_name, _ in [item for group in groups for item in group] + list(items):
+                    if item_name not in item_names:
+                        raise ValidationError("Item %s is required by region %s but is misspelled or does not exist." % (item_name, region_name))
 
     @staticmethod
     def checkRegionNamesInLocations():
@@ -239,13 +205,8 @@ class DataValidation():
         from .Helpers import get_items_with_value, get_items_for_player, filter_used_regions
         player = world.player
         values_requested = {}
-        player_regions = []
-
         #Grab all the player's regions
-        for region in multiworld.regions:
-            if region.player != player:
-                continue
-            player_regions.append(region)
+        player_regions = list(multiworld.get_regions(player))
 
         used_regions = filter_used_regions(player_regions)
         used_regions_names = {r.name for r in set(used_regions)}
@@ -329,6 +290,8 @@ class DataValidation():
 
     @staticmethod
     def checkStartingItemsForValidItemsAndCategories():
+        from .Items import category_name_to_item_names
+
         if "starting_items" not in DataValidation.game_table:
             return
 
@@ -345,7 +308,7 @@ class DataValidation():
 
             if "item_categories" in starting_block:
                 for category_name in starting_block["item_categories"]:
-                    if len([item for item in DataValidation.item_table if "category" in item and category_name in item["category"]]) == 0:
+                    if category_name not in category_name_to_item_names:
                         raise ValidationError("Item category %s is set as a starting item category, but is misspelled or is not defined on any items." % (category_name))
 
     @staticmethod
@@ -394,6 +357,8 @@ class DataValidation():
 
     @staticmethod
     def checkPlacedItemCategoriesForValidItemCategories():
+        from .Items import category_name_to_item_names
+
         for location in DataValidation.location_table:
             if not (place_item_category := location.get("place_item_category", False)):
                 continue
@@ -403,7 +368,7 @@ class DataValidation():
                 continue
 
             for category_name in place_item_category:
-                if len([item for item in DataValidation.item_table if "category" in item and category_name in item["category"]]) == 0:
+                if category_name not in category_name_to_item_names:
                     raise ValidationError("Item category %s is placed (using place_item_category) on a location, but is misspelled or is not defined." % (category_name))
 
     @staticmethod
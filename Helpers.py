@@ -4,7 +4,7 @@ import os
 import pkgutil
 import json
 
-from BaseClasses import MultiWorld, Item
+from BaseClasses import MultiWorld, Item, CollectionState
 from enum import IntEnum
 from typing import Optional, List, TYPE_CHECKING, Union, get_args, get_origin, Any
 from types import GenericAlias
@@ -173,6 +173,20 @@ def get_items_with_value(world: World, multiworld: MultiWorld, value: str, playe
     return world.item_values[player].get(value)
 
 
+def get_state_cache(state: CollectionState, player: int, name: str) -> dict:
+    """Get a cache stored on the state for this player, it is emptied by ManualWorld.collect/remove whenever the player's items change.\n
+    A copy of the state starts with no cache."""
+    caches = getattr(state, "manual_caches", None)
+    if caches is None:
+        caches = state.manual_caches = {}
+    return caches.setdefault(player, {}).setdefault(name, {})
+
+def clear_state_caches(state: CollectionState, player: int):
+    """Empty every cache get_state_cache stored on the state for this player"""
+    caches = getattr(state, "manual_caches", None)
+    if caches:
+        caches.pop(player, None)
+
 def filter_used_regions(player_regions: dict|list) -> set:
     """Return a set of regions that are actually used in Generation. It includes region that have no locations but are required by other regions\n
     The dict version of the player_regions must be in the format: dict(region name str: region)
@@ -215,6 +229,16 @@ def format_to_valid_identifier(input: str) -> str:
         input = "_" + input
     return input.replace(" ", "_")
 
+def state_independent(func):
+    """Decorator for requirement functions whose result only depends on the options (not on the CollectionState).\n
+    set_rules runs those once per player and uses their result directly instead of calling them on every access check."""
+    func.state_independent = True
+    return func
+
+def is_state_independent(func) -> bool:
+    """Was the requirement function marked with @state_independent?"""
+    return getattr(func, "state_independent", False)
+
 class ProgItemsCat(IntEnum):
     VALUE = 1
     CATEGORY = 2
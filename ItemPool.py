@@ -0,0 +1,210 @@
+from collections import Counter, deque
+from collections.abc import MutableSequence
+from typing import Iterable, Iterator, Optional, Union
+
+from BaseClasses import Item, ItemClassification
+
+
+class ItemPool(MutableSequence):
+    """The item pool of a player while create_items builds it, keeping the items in order like a list
+    but also indexed by name, so taking or removing items by name doesn't have to scan the whole pool.\n
+    It's a MutableSequence, so hooks can use it like the list it used to be (indexing, slicing, pop(), insert(), +=, random.shuffle(), sort()...),
+    use take()/remove_n() to remove items by name, select() to get the items with some names and as_list() to get a plain list copy.
+    Changing the items by position only marks the name index as outdated, it's rebuilt once by the next lookup by name.
+    A hook can also return a plain list, create_items turns it back into an ItemPool."""
+
+    # compact the pool once at least this many removed items are left behind, and they are at least half the pool
+    _COMPACT_THRESHOLD = 64
+
+    def __init__(self, items: Iterable[Item] = ()):
+        # the removed items are replaced by None until the pool is compacted, so the indexes below stay valid
+        self._items: list[Optional[Item]] = []
+        # the indexes of the items by name, in pool order. Indexes of removed items are skipped and dropped lazily
+        self._indexes_by_name: dict[str, deque[int]] = {}
+        self._counts: Counter[str] = Counter()
+        self._removed = 0
+        # set when the items were changed by position, the name index and counts above have to be rebuilt before being used
+        self._dirty = False
+        self.extend(items)
+
+    @classmethod
+    def of(cls, items: Iterable[Item]) -> "ItemPool":
+        """Return items as is if it's already an ItemPool, otherwise a new ItemPool with the same items"""
+        return items if isinstance(items, ItemPool) else cls(items)
+
+    def append(self, item: Item):
+        if self._dirty:
+            self._items.append(item)
+            return
+        indexes = self._indexes_by_name.get(item.name)
+        if indexes is None:
+            indexes = self._indexes_by_name[item.name] = deque()
+        indexes.append(len(self._items))
+        self._items.append(item)
+        self._counts[item.name] += 1
+
+    def extend(self, items: Iterable[Item]):
+        for item in items:
+            self.append(item)
+
+    def count(self, name: Union[str, Item], classification: Optional[ItemClassification] = None) -> int:
+        """Return how many items named name are in the pool, only counting the ones with that exact classification if it's given.\n
+        Like list.count, an item can be given instead of its name."""
+        if isinstance(name, Item):
+            name = name.name
+        self._update_index()
+        if classification is None:
+            return self._counts[name]
+        return sum(1 for item in self._items_named(name) if item.classification == classification)
+
+    def take(self, name: str, classification: Optional[ItemClassification] = None) -> Item:
+        """Remove and return the first item named name in the pool, with that exact classification if it's given.\n
+        Raises ValueError if there is no such item."""
+        self._update_index()
+        indexes = self._live_indexes(name)
+        if indexes:
+            if classification is None:
+                return self._pop_index(indexes.popleft())
+            for index in indexes:
+                item = self._items[index]
+                if item is not None and item.classification == classification:
+                    # its index stays in the deque until it's at the front, it's skipped as the item is gone
+                    return self._pop_index(index)
+        raise ValueError(f"No {name} item{'' if classification is None else f' of classification {classification!r}'} in the item pool")
+
+    def remove_n(self, name: str, count: int, classification: Optional[ItemClassification] = None) -> list[Item]:
+        """Remove and return the first count items named name in the pool, with that exact classification if it's given.\n
+        Raises ValueError without removing anything if there aren't enough of them."""
+        if count <= 0:
+            return []
+        available = self.count(name, classification)
+        if available < count:
+            raise ValueError(f"Cannot remove {count} {name} items from the item pool, it only has {available}")
+        return [self.take(name, classification) for _ in range(count)]
+
+    def remove_all(self, items: Iterable[Item]):
+        """Like calling remove for each of the items, but each name is only looked up once.
+
+        Raises ValueError without removing anything if the pool doesn't have enough items of one of the names."""
+        self._update_index()
+        counts = Counter(item.name for item in items)
+        for name, count in counts.items():
+            if self._counts[name] < count:
+                raise ValueError(f"Cannot remove {count} {name} items from the item pool, it only has {self._counts[name]}")
+        for name, count in counts.items():
+            self.remove_n(name, count)
+
+    def select(self, names: Iterable[str]) -> list[Item]:
+        """Return the items of the pool named any of names, in pool order, without going through the items with other names"""
+        self._update_index()
+        indexes = []
+        for name in set(names):
+            indexes.extend(self._live_indexes(name))
+        indexes.sort()
+        items = self._items
+        return [items[index] for index in indexes if items[index] is not None]
+
+    def remove(self, item: Item):
+        """Like list.remove, removes the first item in the pool equal to item, which for an Item means having the same name and player"""
+        self._update_index()
+        for index in self._live_indexes(item.name):
+            pool_item = self._items[index]
+            if pool_item is not None and pool_item == item:
+                self._pop_index(index)
+                return
+        raise ValueError(f"{item} is not in the item pool")
+
+    def insert(self, index: int, item: Item):
+        self._compact()
+        self._items.insert(index, item)
+        self._dirty = True
+
+    def pop(self, index: int = -1) -> Item:
+        self._compact()
+        item = self._items.pop(index)
+        self._dirty = True
+        return item
+
+    def clear(self):
+        self._items = []
+        self._indexes_by_name = {}
+        self._counts = Counter()
+        self._removed = 0
+        self._dirty = False
+
+    def sort(self, *, key=None, reverse: bool = False):
+        self._compact()
+        self._items.sort(key=key, reverse=reverse)
+        self._dirty = True
+
+    def as_list(self) -> list[Item]:
+        """Return a list of the items in the pool, in order. Changing it doesn't change the pool"""
+        return [item for item in self._items if item is not None]
+
+    def _live_indexes(self, name: str) -> deque[int]:
+        """The indexes of the items named name, after dropping the ones of removed items at the front"""
+        indexes = self._indexes_by_name.get(name)
+        if indexes is None:
+            return deque()
+        while indexes and self._items[indexes[0]] is None:
+            indexes.popleft()
+        return indexes
+
+    def _items_named(self, name: str) -> Iterator[Item]:
+        for index in self._live_indexes(name):
+            item = self._items[index]
+            if item is not None:
+                yield item
+
+    def _pop_index(self, index: int) -> Item:
+        item = self._items[index]
+        self._items[index] = None
+        self._counts[item.name] -= 1
+        self._removed += 1
+        if self._removed >= self._COMPACT_THRESHOLD and self._removed * 2 >= len(self._items):
+            self._rebuild()
+        return item
+
+    def _rebuild(self):
+        """Drop the removed items and rebuild the name index and counts"""
+        items = self.as_list()
+        self.clear()
+        self.extend(items)
+
+    def _compact(self):
+        """Drop the removed items so positions in _items are the positions in the pool"""
+        if self._removed:
+            self._rebuild()
+
+    def _update_index(self):
+        if self._dirty:
+            self._rebuild()
+
+    def __iter__(self) -> Iterator[Item]:
+        return (item for item in self._items if item is not None)
+
+    def __len__(self) -> int:
+        return len(self._items) - self._removed
+
+    def __contains__(self, item) -> bool:
+        if not isinstance(item, Item):
+            return False
+        self._update_index()
+        return any(pool_item == item for pool_item in self._items_named(item.name))
+
+    def __getitem__(self, index):
+        self._compact()
+        return self._items[index]
+
+    def __setitem__(self, index, value):
+        self._compact()
+        self._items[index] = value
+        self._dirty = True
+
+    def __delitem__(self, index):
+        self._compact()
+        del self._items[index]
+        self._dirty = True
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.as_list()!r})"
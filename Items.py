@@ -1,67 +1,121 @@
+from collections import Counter
+from types import MappingProxyType
+from typing import Iterable, Mapping
+
 from BaseClasses import Item
 from .Data import item_table
 from .Game import filler_item_name, starting_index
+from .DataBundle import data_bundle
+from .Helpers import format_state_prog_items_key, ProgItemsCat
+from .Records import ItemRecord
 
 
 ######################
 # Generate item lookups
 ######################
 
-item_id_to_name: dict[int, str] = {}
-item_name_to_item: dict[str, dict] = {}
-item_name_groups: dict[str, str] = {}
-advancement_item_names: set[str] = set()
-lastItemId = -1
-
-count = starting_index
-
-# add the filler item to the list of items for lookup
-if filler_item_name:
-    item_table.append({
-        "name": filler_item_name
-    })
-
-# add sequential generated ids to the lists
-for key, val in enumerate(item_table):
-    if "id" in item_table[key]:
-        item_id = item_table[key]["id"]
-        if item_id >= count:
-            count = item_id
-        else:
-            raise ValueError(f"{item_table[key]['name']} has an invalid ID. ID must be at least {count + 1}")
-
-    item_table[key]["id"] = count
-    item_table[key]["progression"] = val["progression"] if "progression" in val else False
-    if isinstance(val.get("category", []), str):
-        item_table[key]["category"] = [val["category"]]
+if data_bundle is not None:
+    item_id_to_name: dict[int, str] = data_bundle["Items"]["item_id_to_name"]
+    item_name_to_item: dict[str, ItemRecord] = data_bundle["Items"]["item_name_to_item"]
+    item_name_groups: dict[str, str] = data_bundle["Items"]["item_name_groups"]
+    _category_to_item_names: dict[str, set[str]] = data_bundle["Items"]["_category_to_item_names"]
+    advancement_item_names: set[str] = data_bundle["Items"]["advancement_item_names"]
+    lastItemId = data_bundle["Items"]["lastItemId"]
+    item_name_to_id: dict[str, int] = data_bundle["Items"]["item_name_to_id"]
+else:
+    item_id_to_name: dict[int, str] = {}
+    item_name_to_item: dict[str, ItemRecord] = {}
+    item_name_groups: dict[str, str] = {}
+    _category_to_item_names: dict[str, set[str]] = {}
+    advancement_item_names: set[str] = set()
+    lastItemId = -1
+
+    count = starting_index
+
+    # add the filler item to the list of items for lookup
+    if filler_item_name:
+        item_table.append({
+            "name": filler_item_name
+        })
+
+    # add sequential generated ids to the lists
+    for key, val in enumerate(item_table):
+        if "id" in item_table[key]:
+            item_id = item_table[key]["id"]
+            if item_id >= count:
+                count = item_id
+            else:
+                raise ValueError(f"{item_table[key]['name']} has an invalid ID. ID must be at least {count + 1}")
+
+        item_table[key]["id"] = count
+        item_table[key]["progression"] = val["progression"] if "progression" in val else False
+        if isinstance(val.get("category", []), str):
+            item_table[key]["category"] = [val["category"]]
         
-    count += 1
-
-for item in item_table:
-    item_name = item["name"]
-    item_id_to_name[item["id"]] = item_name
-    item_name_to_item[item_name] = item
-
-    if item["id"] is not None:
-        lastItemId = max(lastItemId, item["id"])
-
-    for c in item.get("category", []):
-        if c not in item_name_groups:
-            item_name_groups[c] = []
-        item_name_groups[c].append(item_name)
-
-    #Just lowercase the values here to remove all the .lower.strip down the line
-    item['value'] = {k.lower().strip(): v
-                     for k, v in item.get('value', {}).items()}
-
-    for v in item.get("value", {}).keys():
-        group_name = f"has_{v}_value"
-        if group_name not in item_name_groups:
-            item_name_groups[group_name] = []
-        item_name_groups[group_name].append(item_name)
-
-item_id_to_name[None] = "__Victory__"
-item_name_to_id = {name: id for id, name in item_id_to_name.items()}
+        count += 1
+
+    for item in item_table:
+        item_name = item["name"]
+        item_id_to_name[item["id"]] = item_name
+        item_name_to_item[item_name] = item
+
+        if item["id"] is not None:
+            lastItemId = max(lastItemId, item["id"])
+
+        for c in item.get("category", []):
+            if c not in item_name_groups:
+                item_name_groups[c] = []
+            item_name_groups[c].append(item_name)
+            _category_to_item_names.setdefault(c, set()).add(item_name)
+
+        #Just lowercase the values here to remove all the .lower.strip down the line
+        if 'value' in item:
+            item['value'] = {k.lower().strip(): v
+                             for k, v in item['value'].items()}
+
+        for v in item.get("value", {}).keys():
+            group_name = f"has_{v}_value"
+            if group_name not in item_name_groups:
+                item_name_groups[group_name] = []
+            item_name_groups[group_name].append(item_name)
+
+    # the entries won't change anymore, swap them for read-only records which take less memory than one dict each
+    for key, item in enumerate(item_table):
+        item_table[key] = item_name_to_item[item["name"]] = ItemRecord(item)
+
+    item_id_to_name[None] = "__Victory__"
+    item_name_to_id = {name: id for id, name in item_id_to_name.items()}
+
+# Read-only category index, use it instead of looping over every item to find the ones in a category
+category_name_to_item_names: Mapping[str, frozenset[str]] = MappingProxyType({c: frozenset(names) for c, names in _category_to_item_names.items()})
+
+def get_item_names_in_categories(categories: Iterable[str]) -> frozenset[str]:
+    """Returns the name of every item that is in at least one of the given categories"""
+    return frozenset().union(*(category_name_to_item_names.get(c, ()) for c in categories))
+
+# Each category's item count is kept in the CollectionState by ManualWorld.collect/remove under these keys.
+# A category whose key would be shared with another category (eg. "Key" and "key") isn't counted, since both would get mixed up.
+_category_keys = {c: format_state_prog_items_key(ProgItemsCat.CATEGORY, c) for c in category_name_to_item_names}
+_category_key_counts = Counter(_category_keys.values())
+
+if data_bundle is not None:
+    category_state_keys: dict[str, str] = data_bundle["Items"]["category_state_keys"]
+    item_name_to_category_keys: dict[str, tuple[str, ...]] = data_bundle["Items"]["item_name_to_category_keys"]
+    item_name_to_values: dict[str, tuple[tuple[str, int], ...]] = data_bundle["Items"]["item_name_to_values"]
+else:
+    category_state_keys: dict[str, str] = {c: key for c, key in _category_keys.items() if _category_key_counts[key] == 1}
+    item_name_to_category_keys: dict[str, tuple[str, ...]] = {}
+
+    for item in item_table:
+        keys = tuple(category_state_keys[c] for c in dict.fromkeys(item.get("category", [])) if c in category_state_keys)
+        if keys:
+            item_name_to_category_keys[item["name"]] = keys
+
+    # The state keys and amounts ManualWorld.collect/remove add or remove for the items that have a value, so they don't read the item's record
+    item_name_to_values: dict[str, tuple[tuple[str, int], ...]] = {
+        item["name"]: tuple((format_state_prog_items_key(ProgItemsCat.VALUE, key), int(value)) for key, value in item["value"].items())
+        for item in item_table if item.get("value")
+    }
 
 
 ######################
@@ -1,64 +1,124 @@
 from BaseClasses import Location
 from .Data import location_table
 from .Game import starting_index
+from .DataBundle import data_bundle
+from .Records import LocationRecord
 
 
 ######################
-# Generate location lookups
+# Location templates
 ######################
 
-count = starting_index
-victory_names: list[str] = []
-
-# add sequential generated ids to the lists
-for key, _ in enumerate(location_table):
-    if "victory" in location_table[key] and location_table[key]["victory"]:
-        victory_names.append(location_table[key]["name"])
-
-    if "id" in location_table[key]:
-        item_id = location_table[key]["id"]
-        if item_id >= count:
-            count = item_id
-        else:
-            raise ValueError(f"{location_table[key]['name']} has an invalid ID. ID must be at least {count + 1}")
-
-    location_table[key]["id"] = count
-
-    if "region" not in location_table[key]:
-        location_table[key]["region"] = "Manual" # all locations are in the same region for Manual
-
-    if isinstance(location_table[key].get("category", []), str):
-        location_table[key]["category"] = [location_table[key]["category"]]
+def _fill_template(value, placeholder: str, index: int):
+    if isinstance(value, str):
+        return value.replace(placeholder, str(index))
+    if isinstance(value, list):
+        return [_fill_template(v, placeholder, index) for v in value]
+    if isinstance(value, dict):
+        return {key: _fill_template(v, placeholder, index) for key, v in value.items()}
+    return value
+
+def expand_location_template(location: dict) -> list[dict]:
+    """Return the locations of a location family, written as one location with a "template" key in the format
+    {"parameter": [first, last]}. There is one location for each index from first to last (both included), in order,
+    with every "{parameter}" in its strings replaced by the index. If the template has an id it's the id of the first location
+    and the others follow it, like any location without an id. A location without a template is returned as is."""
+    if "template" not in location:
+        return [location]
+
+    ((parameter, (first, last)),) = location["template"].items()
+    placeholder = "{" + parameter + "}"
+    expanded = []
+    for index in range(first, last + 1):
+        member = {key: _fill_template(value, placeholder, index) for key, value in location.items() if key != "template" and key != "id"}
+        if "id" in location and index == first:
+            member = {"id": location["id"], **member}
+        expanded.append(member)
+    return expanded
 
-    count += 1
 
-if not victory_names:
-    # Add the game completion location, which will have the Victory item assigned to it automatically
-    location_table.append({
-        "id": count + 1,
-        "name": "__Manual Game Complete__",
-        "region": "Manual",
-        "requires": []
-        # "category": custom_victory_location["category"] if "category" in custom_victory_location else []
-    })
-    victory_names.append("__Manual Game Complete__")
-
-location_id_to_name: dict[int, str] = {}
-location_name_to_location: dict[str, dict] = {}
-location_name_groups: dict[str, list[str]] = {}
-
-for item in location_table:
-    location_id_to_name[item["id"]] = item["name"]
-    location_name_to_location[item["name"]] = item
-
-    for c in item.get("category", []):
-        if c not in location_name_groups:
-            location_name_groups[c] = []
-        location_name_groups[c].append(item["name"])
+######################
+# Generate location lookups
+######################
 
+if data_bundle is not None:
+    location_families: dict[str, dict[str, int]] = data_bundle["Locations"]["location_families"]
+    victory_names: list[str] = data_bundle["Locations"]["victory_names"]
+    location_id_to_name: dict[int, str] = data_bundle["Locations"]["location_id_to_name"]
+    location_name_to_location: dict[str, LocationRecord] = data_bundle["Locations"]["location_name_to_location"]
+    location_name_groups: dict[str, list[str]] = data_bundle["Locations"]["location_name_groups"]
+    location_name_to_id: dict[str, int] = data_bundle["Locations"]["location_name_to_id"]
+else:
+    # The locations of a family (eg. "Gather {count} Trophies") by the family's name then by their index in the family.
+    # They all get a name and an id, but Regions.create_regions only creates the ones hook_get_location_family_indexes enables.
+    location_families: dict[str, dict[str, int]] = {}
+
+    expanded_table = []
+    for location in location_table:
+        members = expand_location_template(location)
+        if "template" in location:
+            ((first, _),) = location["template"].values()
+            location_families[location["name"]] = {member["name"]: first + i for i, member in enumerate(members)}
+        expanded_table.extend(members)
+    location_table[:] = expanded_table
+
+    count = starting_index
+    victory_names: list[str] = []
+
+    # add sequential generated ids to the lists
+    for key, _ in enumerate(location_table):
+        if "victory" in location_table[key] and location_table[key]["victory"]:
+            victory_names.append(location_table[key]["name"])
+
+        if "id" in location_table[key]:
+            item_id = location_table[key]["id"]
+            if item_id >= count:
+                count = item_id
+            else:
+                raise ValueError(f"{location_table[key]['name']} has an invalid ID. ID must be at least {count + 1}")
+
+        location_table[key]["id"] = count
+
+        if "region" not in location_table[key]:
+            location_table[key]["region"] = "Manual" # all locations are in the same region for Manual
+
+        if isinstance(location_table[key].get("category", []), str):
+            location_table[key]["category"] = [location_table[key]["category"]]
+
+        count += 1
+
+    if not victory_names:
+        # Add the game completion location, which will have the Victory item assigned to it automatically
+        location_table.append({
+            "id": count + 1,
+            "name": "__Manual Game Complete__",
+            "region": "Manual",
+            "requires": []
+            # "category": custom_victory_location["category"] if "category" in custom_victory_location else []
+        })
+        victory_names.append("__Manual Game Complete__")
+
+    location_id_to_name: dict[int, str] = {}
+    location_name_to_location: dict[str, LocationRecord] = {}
+    location_name_groups: dict[str, list[str]] = {}
+
+    for item in location_table:
+        location_id_to_name[item["id"]] = item["name"]
+        location_name_to_location[item["name"]] = item
+
+        for c in item.get("category", []):
+            if c not in location_name_groups:
+                location_name_groups[c] = []
+            location_name_groups[c].append(item["name"])
+
+    # the entries won't change anymore, swap them for read-only records which take less memory than one dict each
+    for key, location in enumerate(location_table):
+        location_table[key] = location_name_to_location[location["name"]] = LocationRecord(location)
+
+
+    # location_id_to_name[None] = "__Manual Game Complete__"
+    location_name_to_id = {name: id for id, name in location_id_to_name.items()}
 
-# location_id_to_name[None] = "__Manual Game Complete__"
-location_name_to_id = {name: id for id, name in location_id_to_name.items()}
 
 ######################
 # Location classes
@@ -106,6 +106,8 @@ class ManualContext(SuperContext):
         self.syncing = False
         self.game = game
         self.username = player_name
+        self.world_location_copies: dict[str, dict[str, Any]] = {}
+        self.world_item_copies: dict[str, dict[str, Any]] = {}
 
     async def server_auth(self, password_requested: bool = False):
         if password_requested and not self.password:
@@ -115,6 +117,8 @@ class ManualContext(SuperContext):
             raise Exception("The Manual client can only be used for Manual games.")
 
         self.game = self.ui.game_bar_text.text
+        self.world_location_copies = {}
+        self.world_item_copies = {}
 
         world = AutoWorldRegister.world_types.get(self.game)
         if not self.location_table and not self.item_table and world is None:
@@ -148,7 +152,11 @@ class ManualContext(SuperContext):
         location = self.location_table.get(name)
         if not location:
             # It is absolutely possible to pull categories from the data_package via self.update_game. I have not done this yet.
-            location = AutoWorldRegister.world_types[self.game].location_name_to_location.get(name, {"name": name})
+            # The world's locations are read-only, keep a copy the client can change (eg. to add the "(Hinted)" category)
+            location = self.world_location_copies.get(name)
+            if location is None:
+                location = AutoWorldRegister.world_types[self.game].location_name_to_location.get(name, {"name": name})
+                location = self.world_location_copies[name] = {**location, "category": list(location.get("category", []))}
         return location
 
     def get_location_by_id(self, id) -> dict[str, Any]:
@@ -158,7 +166,11 @@ class ManualContext(SuperContext):
     def get_item_by_name(self, name):
         item = self.item_table.get(name)
         if not item:
-            item = AutoWorldRegister.world_types[self.game].item_name_to_item.get(name, {"name": name})
+            # The world's items are read-only too, keep a copy the client can change (eg. to add the "(No Category)" category)
+            item = self.world_item_copies.get(name)
+            if item is None:
+                item = AutoWorldRegister.world_types[self.game].item_name_to_item.get(name, {"name": name})
+                item = self.world_item_copies[name] = {**item, "category": list(item.get("category", []))}
         return item
 
     def get_item_by_id(self, id):
@@ -0,0 +1,95 @@
+import sys
+from collections.abc import Mapping
+from typing import Any, Iterator
+
+_MISSING = object()
+# every record with the same categories shares one tuple
+_category_tuples: dict[tuple[str, ...], tuple[str, ...]] = {}
+
+def intern_categories(categories) -> tuple[str, ...]:
+    """Return the categories as a tuple of interned strings, shared with every other record having the same categories"""
+    categories = tuple(sys.intern(c) for c in categories)
+    return _category_tuples.setdefault(categories, categories)
+
+
+class ManualRecord(Mapping):
+    """Read-only record of an item/location from the data files, built once they are fully processed by Items.py/Locations.py.\n
+    The usual keys are stored in __slots__ (readable as attributes too, eg. item.name) instead of one dict per entry,
+    and any other key a hook or the data added is kept in a small dict. It's also a read-only Mapping,
+    so item["name"], item.get("count", 1) and "category" in item work like they did with the dicts.
+    Use dict(record) to get a dict that can be changed."""
+    __slots__ = ("_extra",)
+    _fields: tuple[str, ...] = ()
+    _field_set: frozenset[str] = frozenset()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._field_set = frozenset(cls._fields)
+
+    def __init__(self, data: Mapping):
+        setattr_ = object.__setattr__
+        for field in self._fields:
+            # a key the data doesn't have leaves its slot unset, so the attribute raises AttributeError like the key raises KeyError
+            if field not in data:
+                continue
+            value = data[field]
+            if field == "category":
+                value = intern_categories(value)
+            elif field == "name":
+                value = sys.intern(value)
+            setattr_(self, field, value)
+        setattr_(self, "_extra", {key: value for key, value in data.items() if key not in self._field_set} or None)
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError(f"{type(self).__name__} is read-only, use dict() on it to get a copy that can be changed")
+
+    def __delattr__(self, name: str):
+        raise AttributeError(f"{type(self).__name__} is read-only, use dict() on it to get a copy that can be changed")
+
+    def __reduce__(self):
+        return type(self), (dict(self),)
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._field_set:
+            value = getattr(self, key, _MISSING)
+            if value is not _MISSING:
+                return value
+        elif self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self._field_set:
+            value = getattr(self, key, _MISSING)
+            return default if value is _MISSING else value
+        if self._extra is not None:
+            return self._extra.get(key, default)
+        return default
+
+    def __contains__(self, key) -> bool:
+        if key in self._field_set:
+            return getattr(self, key, _MISSING) is not _MISSING
+        return self._extra is not None and key in self._extra
+
+    def __iter__(self) -> Iterator[str]:
+        for field in self._fields:
+            if getattr(self, field, _MISSING) is not _MISSING:
+                yield field
+        if self._extra is not None:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self)!r})"
+
+class ItemRecord(ManualRecord):
+    _fields = ("name", "id", "category", "count", "value", "progression", "useful", "trap", "filler",
+               "progression_skip_balancing", "early", "local", "local_early")
+    __slots__ = _fields
+
+class LocationRecord(ManualRecord):
+    _fields = ("name", "id", "region", "category", "requires", "victory", "place_item", "place_item_category",
+               "dont_place_item", "dont_place_item_category", "hidden", "prehint")
+    __slots__ = _fields
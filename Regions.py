@@ -1,8 +1,9 @@
 from BaseClasses import Entrance, MultiWorld, Region
-from .Helpers import is_category_enabled, is_location_enabled
+from .Helpers import is_category_enabled, is_location_enabled, get_option_value
 from .Data import region_table
-from .Locations import ManualLocation, location_name_to_location
+from .Locations import ManualLocation, location_name_to_location, location_families, victory_names
 from worlds.AutoWorld import World
+from .hooks.World import hook_get_location_family_indexes
 
 
 if not region_table:
@@ -20,7 +21,29 @@ regionMap["Manual"] = {
 }
 
 
+def get_skipped_location_names(world: World, multiworld: MultiWorld, player: int) -> set[str]:
+    """The locations this player doesn't need created: the victory locations other than the goal
+    and the members of location families whose index hook_get_location_family_indexes didn't enable"""
+    goal_name = victory_names[get_option_value(multiworld, player, 'goal')]
+    skipped = {name for name in victory_names if name != goal_name}
+
+    for family_name, members in location_families.items():
+        indexes = hook_get_location_family_indexes(family_name, world, multiworld, player)
+        if indexes is not None:
+            skipped.update(name for name, index in members.items() if index not in indexes)
+
+    return skipped
+
 def create_regions(world: World, multiworld: MultiWorld, player: int):
+    skipped_locations = get_skipped_location_names(world, multiworld, player)
+
+    # The names of the locations to create in each region, in the order of the location table
+    region_location_names: dict[str, list[str]] = {}
+    for location in world.location_table:
+        if location.get("region") in regionMap and location["name"] not in skipped_locations:
+            if is_location_enabled(multiworld, player, location):
+                region_location_names.setdefault(location["region"], []).append(location["name"])
+
     # Create regions and assign locations to each region
     for region in regionMap:
         if "connects_to" not in regionMap[region]:
@@ -32,11 +55,7 @@ def create_regions(world: World, multiworld: MultiWorld, player: int):
         if not exit_array:
             exit_array = None
 
-        locations = []
-        for location in world.location_table:
-            if "region" in location and location["region"] == region:
-                if is_location_enabled(multiworld, player, location):
-                    locations.append(location["name"])
+        locations = region_location_names.get(region, [])
 
         new_region = create_region(world, multiworld, player, region, locations, exit_array)
         multiworld.regions += [new_region]
@@ -63,6 +82,7 @@ def create_region(world: World, multiworld: MultiWorld, player: int, name: str,
             if location_name_to_location[location].get('prehint'):
                 world.options.start_location_hints.value.add(location)
             ret.locations.append(locationObj)
+            world.manual_locations[location] = locationObj
     if exits:
         for exit in exits:
             ret.exits.append(Entrance(player, getConnectionName(name, exit), ret))
@@ -0,0 +1,871 @@
+import math
+import re
+from bisect import bisect_right
+from typing import TYPE_CHECKING, Callable, Optional
+
+from BaseClasses import CollectionState
+
+from .Helpers import clamp, is_state_independent, get_state_cache
+
+if TYPE_CHECKING:
+    from . import ManualWorld
+
+
+# A compiled requires is a plain callable taking the state, just like any other access rule
+Rule = Callable[[CollectionState], bool]
+
+
+class RequiresCompileError(Exception):
+    """The requires uses syntax the compiler doesn't handle; it should be interpreted by Rules instead."""
+    pass
+
+
+######################
+# Requires AST
+######################
+
+class RequiresNode:
+    __slots__ = ()
+
+class Constant(RequiresNode):
+    __slots__ = ("value",)
+
+    def __init__(self, value: bool):
+        self.value = value
+
+class ItemRequirement(RequiresNode):
+    """|Item| or |Item:count|, count being a number, 'all', 'half' or a percentage"""
+    __slots__ = ("name", "count")
+
+    def __init__(self, name: str, count: str):
+        self.name = name
+        self.count = count
+
+class CategoryRequirement(RequiresNode):
+    """|@Category| or |@Category:count|, count being a number, 'all', 'half' or a percentage"""
+    __slots__ = ("name", "count")
+
+    def __init__(self, name: str, count: str):
+        self.name = name
+        self.count = count
+
+class FunctionCall(RequiresNode):
+    """{Function(args)}, args is kept as the raw text between the parentheses"""
+    __slots__ = ("name", "args")
+
+    def __init__(self, name: str, args: str):
+        self.name = name
+        self.args = args
+
+class Not(RequiresNode):
+    __slots__ = ("operand",)
+
+    def __init__(self, operand: RequiresNode):
+        self.operand = operand
+
+class And(RequiresNode):
+    __slots__ = ("operands",)
+
+    def __init__(self, operands: tuple[RequiresNode, ...]):
+        self.operands = operands
+
+class Or(RequiresNode):
+    __slots__ = ("operands",)
+
+    def __init__(self, operands: tuple[RequiresNode, ...]):
+        self.operands = operands
+
+
+######################
+# Tokenizer and parser
+######################
+
+# Same patterns as the ones used by the interpreter in Rules.py
+_function_pattern = re.compile(r'\{(\w+)\((.*?)\)\}')
+_item_pattern = re.compile(r'\|[^|]+\|')
+_word_pattern = re.compile(r'\w+')
+
+# Characters that can sit right next to an AND/OR for the interpreter to still see it as an operator
+_operator_neighbors = set("()!& \t\r\n")
+
+_AND = "&"
+_OR = "|"
+_NOT = "!"
+_OPEN = "("
+_CLOSE = ")"
+
+def tokenize_requires(requires: str) -> list:
+    """Split a requires string into operator strings and ItemRequirement/CategoryRequirement/FunctionCall nodes.\n
+    Anything the interpreter would read differently from how it looks (stray pipes, text outside of pipes, operators glued to items...)
+    raises a RequiresCompileError."""
+    tokens = []
+    pos = 0
+    length = len(requires)
+
+    while pos < length:
+        c = requires[pos]
+
+        if c.isspace():
+            pos += 1
+            continue
+
+        if c == "{":
+            match = _function_pattern.match(requires, pos)
+            if not match:
+                raise RequiresCompileError(f"Unmatched '{{' at position {pos}")
+            tokens.append(FunctionCall(match.group(1), match.group(2)))
+            pos = match.end()
+            continue
+
+        if c == "|":
+            match = _item_pattern.match(requires, pos)
+            if not match:
+                raise RequiresCompileError(f"Stray '|' at position {pos}")
+            token = match.group(0)
+            if "{" in token or "}" in token:
+                raise RequiresCompileError(f"Function inside of item {token}")
+            tokens.append(_parse_item_token(token))
+            pos = match.end()
+            continue
+
+        if c in "()!&":
+            tokens.append(c)
+            pos += 1
+            continue
+
+        match = _word_pattern.match(requires, pos)
+        if match:
+            word = match.group(0).upper()
+            before = requires[pos - 1] if pos > 0 else " "
+            after = requires[match.end()] if match.end() < length else " "
+            if word not in ("AND", "OR") or before not in _operator_neighbors or after not in _operator_neighbors:
+                raise RequiresCompileError(f"Unexpected text '{match.group(0)}' at position {pos}")
+            tokens.append(_AND if word == "AND" else _OR)
+            pos = match.end()
+            continue
+
+        raise RequiresCompileError(f"Unexpected character '{c}' at position {pos}")
+
+    return tokens
+
+def _parse_item_token(token: str) -> RequiresNode:
+    # mirror the interpreter's string handling exactly, including which parts get stripped
+    is_category = '|@' in token
+    item = token.lstrip('|@$').rstrip('|')
+
+    item_parts = item.split(":")
+    item_name = item
+    item_count = "1"
+
+    if len(item_parts) > 1:
+        item_name = item_parts[0].strip()
+        item_count = item_parts[1].strip()
+
+    if is_category:
+        return CategoryRequirement(item_name, item_count)
+    return ItemRequirement(item_name, item_count)
+
+class _Parser:
+    """Recursive descent over the tokens. Like infix_to_postfix, AND and OR have the same precedence and are
+    evaluated left to right, while ! only applies to what directly follows it."""
+    def __init__(self, tokens: list):
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def take(self):
+        token = self.peek()
+        self.pos += 1
+        return token
+
+    def parse(self) -> RequiresNode:
+        node = self.expression()
+        if self.pos != len(self.tokens):
+            raise RequiresCompileError(f"Unexpected '{self.peek()}'")
+        return node
+
+    def expression(self) -> RequiresNode:
+        node = self.unary()
+        while self.peek() in (_AND, _OR):
+            operator = self.take()
+            right = self.unary()
+            node = _combine(And if operator == _AND else Or, node, right)
+        return node
+
+    def unary(self) -> RequiresNode:
+        if self.peek() == _NOT:
+            self.take()
+            if self.peek() == _NOT:
+                raise RequiresCompileError("Double negation") # the interpreter errors on !!
+            return Not(self.primary())
+        return self.primary()
+
+    def primary(self) -> RequiresNode:
+        token = self.take()
+        if isinstance(token, RequiresNode):
+            return token
+        if token == _OPEN:
+            node = self.expression()
+            if self.take() != _CLOSE:
+                raise RequiresCompileError("Missing ')'")
+            return node
+        raise RequiresCompileError(f"Unexpected '{token}'")
+
+def _combine(node_type: type, left: RequiresNode, right: RequiresNode) -> RequiresNode:
+    # (A & B) & C becomes a single And(A, B, C), a parenthesized (B & C) on the right stays grouped which doesn't change the result
+    if type(left) is node_type:
+        return node_type(left.operands + (right,))
+    return node_type((left, right))
+
+def parse_requires_list(requires: list | dict) -> tuple[tuple[tuple[tuple[str, int], ...], ...], tuple[tuple[str, int], ...]]:
+    """Parse list form requires into its or-groups and its other items, each item being an (item name, count) pair,
+    the same way Rules.checkRequireDictForArea reads them. Raises a RequiresCompileError for anything it would fail on."""
+    groups = []
+    items = []
+
+    for item in requires:
+        # an object with "or" or a list of items is an or-group
+        if (isinstance(item, dict) and "or" in item and isinstance(item["or"], list)) or isinstance(item, list):
+            or_items = item["or"] if isinstance(item, dict) else item
+            groups.append(tuple(_parse_list_item(or_item) for or_item in or_items))
+        else:
+            items.append(_parse_list_item(item))
+
+    return tuple(groups), tuple(items)
+
+def _parse_list_item(item) -> tuple[str, int]:
+    if not isinstance(item, str):
+        raise RequiresCompileError(f"Invalid item {item!r}")
+
+    item_parts = item.split(":")
+    if len(item_parts) > 1:
+        try:
+            return item_parts[0], int(item_parts[1])
+        except ValueError as e:
+            raise RequiresCompileError(f"Invalid count in {item}") from e
+    return item, 1
+
+def parse_requires(requires: str) -> RequiresNode:
+    """Parse a requires string into its AST. Raises RequiresCompileError if it can't be compiled."""
+    if requires == "":
+        return Constant(True)
+
+    return _Parser(tokenize_requires(requires)).parse()
+
+class ParsedRequires:
+    """A parsed requires string with what the compiler needs from it before any player's options are known:
+    its AST, the key identical ASTs share and its function calls in the order the interpreter runs them.\n
+    None of it depends on the player, so each requires string is parsed once and shared by every player (see ManualWorld.requires_parse_cache)."""
+    __slots__ = ("node", "key", "calls")
+
+    def __init__(self, node: RequiresNode):
+        self.node = node
+        self.key = node_key(node)
+        self.calls = tuple(function_calls(node))
+
+
+######################
+# Lowering to closures
+######################
+
+class _FunctionCalls:
+    """The functions found in one requires.\n
+    folded has the result of the state independent ones, which were called once at compile time.
+    Like the interpreter, a compiled rule calls all the others before evaluating anything, so a function returning
+    a requires string instead of a bool is always noticed. Their results are pushed on the results stack while the rule is evaluated."""
+    __slots__ = ("folded", "indexes", "results")
+
+    def __init__(self):
+        self.folded: dict[FunctionCall, bool] = {}
+        self.indexes: dict[FunctionCall, int] = {}
+        self.results: list[tuple] = []
+
+class CountThresholds:
+    """The locations whose requires is only |Item:N| or |@Category:N| for one same item/category, sorted by N.\n
+    Since having more never makes such a requires False, the locations met by a state are always a prefix of the list."""
+    __slots__ = ("key", "counts", "location_names")
+
+    def __init__(self, key: str, thresholds: list[tuple[int, str]]):
+        thresholds = sorted(thresholds)
+        self.key = key
+        self.counts = [count for count, _ in thresholds]
+        self.location_names = [location_name for _, location_name in thresholds]
+
+    def met(self, state: CollectionState, player: int) -> list[str]:
+        """The names of the locations whose requires the state meets"""
+        return self.location_names[:bisect_right(self.counts, state.count(self.key, player))]
+
+class RequiresCompiler:
+    """Turn the requires of a location/region into a short-circuiting closure for one player.\n
+    get_function(name) must return the requirement function the interpreter would call for that name,
+    run_function(state, area, name, args) must call it the same way the interpreter does,
+    and interpret(state, area) is used as a fallback whenever a compiled rule meets something it can't evaluate by itself.\n
+    Functions marked with @state_independent are called once here, with None as the state, and their result is folded into the rule.
+    A rule that folds down to a constant is returned as always_true or always_false so the caller can check for it with `is`."""
+    def __init__(self, world: "ManualWorld", player: int,
+                 get_function: Callable[[str], Optional[Callable]],
+                 run_function: Callable[[Optional[CollectionState], dict, str, str], object],
+                 interpret: Callable[[CollectionState, dict], bool]):
+        self.world = world
+        self.player = player
+        self.get_function = get_function
+        self.run_function = run_function
+        self.interpret = interpret
+        # shared by the compilers of every player, only the folding and lowering below is done per player
+        self.parse_cache: dict[str, ParsedRequires | RequiresCompileError] = world.requires_parse_cache
+        # results of the @state_independent functions, by function name and arguments
+        self.state_independent_results: dict[tuple[str, str], object] = {}
+        # rules that don't call any function at runtime, shared by every requires with the same AST
+        self.interned_rules: dict[tuple, Rule] = {}
+
+    def compile(self, area: dict) -> Optional[Rule]:
+        """Return a rule equivalent to the area's requires, or None if it has to be interpreted."""
+        requires = area.get("requires")
+        if not isinstance(requires, str):
+            # an empty list/dict is how regions and locations usually say they have no requires
+            if not requires:
+                return always_true
+            if not isinstance(requires, (list, dict)):
+                return None
+
+            try:
+                return self.compile_list(*parse_requires_list(requires))
+            except RequiresCompileError:
+                return None
+
+        try:
+            parsed = self.parse(requires)
+            node, key = parsed.node, parsed.key
+            if key in self.interned_rules:
+                return self.interned_rules[key]
+
+            calls = self.fold_functions(parsed.calls, area)
+            rule = self.lower(node, calls)
+        except RequiresCompileError:
+            return None
+
+        if not calls.indexes:
+            if rule is not always_true and rule is not always_false and isinstance(node, (And, Or, Not)):
+                rule = self.memoize(rule)
+            self.interned_rules[key] = rule
+            return rule
+
+        run_function = self.run_function
+        interpret = self.interpret
+        call_args = tuple((call.name, call.args) for call in calls.indexes)
+        results = calls.results
+
+        def compiled_rule(state: CollectionState) -> bool:
+            values = tuple(run_function(state, area, func_name, func_args) for func_name, func_args in call_args)
+            for value in values:
+                if not isinstance(value, bool):
+                    # a returned requires string gets spliced into the requires by the interpreter, which the closures can't do
+                    return interpret(state, area)
+
+            results.append(values)
+            try:
+                return rule(state)
+            finally:
+                results.pop()
+
+        return compiled_rule
+
+    def parse(self, requires: str) -> ParsedRequires:
+        """Parse a requires string, or get it from the cache if any player already did. Raises RequiresCompileError if it can't be compiled."""
+        parsed = self.parse_cache.get(requires)
+        if parsed is None:
+            try:
+                parsed = ParsedRequires(parse_requires(requires))
+            except RequiresCompileError as e:
+                parsed = e
+            self.parse_cache[requires] = parsed
+
+        if isinstance(parsed, RequiresCompileError):
+            raise RequiresCompileError(*parsed.args)
+        return parsed
+
+    def compile_list(self, groups: tuple[tuple[tuple[str, int], ...], ...], items: tuple[tuple[str, int], ...]) -> Rule:
+        """Compile parsed list form requires. Like the interpreter, it's met if any or-group is fully met or else if every other item is,
+        which means it's always met when there are only or-groups."""
+        if not items:
+            return always_true
+
+        key = ("list", groups, items)
+        if key in self.interned_rules:
+            return self.interned_rules[key]
+
+        player = self.player
+        item_counts = _merge_counts(items)
+        group_counts = tuple(_merge_counts(group) for group in groups)
+
+        if group_counts:
+            def list_rule(state: CollectionState) -> bool:
+                for counts in group_counts:
+                    if state.has_all_counts(counts, player):
+                        return True
+                return state.has_all_counts(item_counts, player)
+        elif len(item_counts) == 1:
+            ((item_name, count),) = item_counts.items()
+            list_rule = lambda state: state.has(item_name, player, count)
+        else:
+            list_rule = lambda state: state.has_all_counts(item_counts, player)
+
+        self.interned_rules[key] = list_rule
+        return list_rule
+
+    def compile_node(self, node: RequiresNode) -> Rule:
+        """Compile an already parsed requires that doesn't call any function, sharing the rule with identical requires like compile does"""
+        key = node_key(node)
+        if key not in self.interned_rules:
+            rule = self.lower(node, _FunctionCalls())
+            if rule is not always_true and rule is not always_false and isinstance(node, (And, Or, Not)):
+                rule = self.memoize(rule)
+            self.interned_rules[key] = rule
+        return self.interned_rules[key]
+
+    def fold(self, node: RequiresNode, area: dict) -> RequiresNode:
+        """Return the node with the @state_independent functions replaced by their bool result and the constants simplified away"""
+        if isinstance(node, FunctionCall):
+            func = self.get_function(node.name)
+            if not callable(func):
+                raise RequiresCompileError(f"Unknown function {node.name}")
+            if is_state_independent(func):
+                result = self.run_state_independent(node, area)
+                if isinstance(result, bool):
+                    return Constant(result)
+            return node
+        if isinstance(node, Not):
+            operand = self.fold(node.operand, area)
+            if isinstance(operand, Constant):
+                return Constant(not operand.value)
+            return Not(operand)
+        if isinstance(node, (And, Or)):
+            # True for an Or / False for an And decides the result, the other value doesn't change it
+            deciding_value = isinstance(node, Or)
+            operands = []
+            for operand in node.operands:
+                operand = self.fold(operand, area)
+                if isinstance(operand, Constant):
+                    if operand.value == deciding_value:
+                        return Constant(deciding_value)
+                    continue
+                operands.append(operand)
+
+            if not operands:
+                return Constant(not deciding_value)
+            if len(operands) == 1:
+                return operands[0]
+            return type(node)(tuple(operands))
+        return node
+
+    def memoize(self, rule: Rule) -> Rule:
+        """Cache the rule's result on the state until the player's items change, for rules shared by many locations"""
+        player = self.player
+        index = len(self.interned_rules)
+
+        def memoized_rule(state: CollectionState) -> bool:
+            cache = get_state_cache(state, player, "rules")
+            result = cache.get(index)
+            if result is None:
+                result = cache[index] = rule(state)
+            return result
+
+        return memoized_rule
+
+    def fold_functions(self, function_calls: tuple[FunctionCall, ...], area: dict) -> _FunctionCalls:
+        calls = _FunctionCalls()
+
+        for call in function_calls:
+            func = self.get_function(call.name)
+            if not callable(func):
+                raise RequiresCompileError(f"Unknown function {call.name}")
+
+            if is_state_independent(func):
+                result = self.run_state_independent(call, area)
+                if isinstance(result, bool):
+                    calls.folded[call] = result
+                    continue
+
+            calls.indexes[call] = len(calls.indexes)
+
+        return calls
+
+    def run_state_independent(self, call: FunctionCall, area: dict):
+        key = (call.name, call.args)
+        if key not in self.state_independent_results:
+            self.state_independent_results[key] = self.run_function(None, area, call.name, call.args)
+        return self.state_independent_results[key]
+
+    def dependencies(self, area: dict) -> Optional[frozenset[str]]:
+        """Return the names of the items the area's requires depend on,
+        or None if that can't be known (eg. it calls a function that uses the state)."""
+        requires = area.get("requires")
+        if not requires:
+            return frozenset()
+
+        if not isinstance(requires, str):
+            if not isinstance(requires, (list, dict)):
+                return None
+
+            try:
+                groups, items = parse_requires_list(requires)
+            except RequiresCompileError:
+                return None
+            if not items:
+                return frozenset()
+            return frozenset(item_name for group in groups + (items,) for item_name, _ in group)
+
+        try:
+            node = self.parse(requires).node
+            return frozenset(self.node_dependencies(node, area))
+        except RequiresCompileError:
+            return None
+
+    def dnf(self, area: dict, max_clauses: int = 32) -> Optional[list[dict[str, int]]]:
+        """Return the area's requires as an OR of clauses, each clause being an AND of "count of key in the state >= N" written as {key: N}.\n
+        An empty list is never met and [{}] is always met. Returns None when the requires can't be written that way
+        (functions that use the state, negations, all/half/% counts...) or needs more than max_clauses clauses."""
+        requires = area.get("requires")
+        if not requires:
+            return [{}]
+        if not isinstance(requires, str):
+            if not isinstance(requires, (list, dict)):
+                return None
+
+            try:
+                groups, items = parse_requires_list(requires)
+            except RequiresCompileError:
+                return None
+            if not items:
+                return [{}]
+            clauses = [_merge_counts(group) for group in groups] + [_merge_counts(items)]
+            return clauses if len(clauses) <= max_clauses else None
+
+        try:
+            return self.node_dnf(self.parse(requires).node, area, max_clauses)
+        except RequiresCompileError:
+            return None
+
+    def node_dnf(self, node: RequiresNode, area: dict, max_clauses: int) -> list[dict[str, int]]:
+        if isinstance(node, Constant):
+            return [{}] if node.value else []
+        if isinstance(node, FunctionCall):
+            func = self.get_function(node.name)
+            if callable(func) and is_state_independent(func):
+                result = self.run_state_independent(node, area)
+                if isinstance(result, bool):
+                    return [{}] if result else []
+            raise RequiresCompileError(f"Function {node.name} can't be written as a DNF")
+        if isinstance(node, (ItemRequirement, CategoryRequirement)):
+            count = _parse_count(node.count, allow_negative=isinstance(node, ItemRequirement))
+            if not isinstance(count, int):
+                raise RequiresCompileError(f"Count {node.count} depends on the pool")
+            if isinstance(node, ItemRequirement):
+                return [{node.name: count}]
+            if not self.world.category_name_to_item_names.get(node.name):
+                return []
+            category_key = self.world.category_state_keys.get(node.name)
+            if category_key is None:
+                raise RequiresCompileError(f"Category {node.name} isn't counted in the state")
+            return [{category_key: count}]
+        if isinstance(node, Not):
+            operand = self.node_dnf(node.operand, area, max_clauses)
+            if operand == []:
+                return [{}]
+            if operand == [{}]:
+                return []
+            raise RequiresCompileError("Negations can't be written as a DNF")
+        if isinstance(node, Or):
+            clauses = [clause for operand in node.operands for clause in self.node_dnf(operand, area, max_clauses)]
+        elif isinstance(node, And):
+            clauses = [{}]
+            for operand in node.operands:
+                operand_clauses = self.node_dnf(operand, area, max_clauses)
+                clauses = [_merge_clauses(clause, operand_clause) for clause in clauses for operand_clause in operand_clauses]
+                if len(clauses) > max_clauses:
+                    break
+        else:
+            raise RequiresCompileError(f"Unknown node {node!r}")
+
+        if len(clauses) > max_clauses:
+            raise RequiresCompileError("Too many clauses")
+        return clauses
+
+    def count_threshold(self, area: dict) -> Optional[tuple[str, int]]:
+        """If the area's requires is a single |Item:N| or |@Category:N| with a fixed N of at least 1
+        (optionally alongside @state_independent functions that are True), return the key counted in the state and N."""
+        requires = area.get("requires")
+        if not isinstance(requires, str):
+            return None
+
+        try:
+            node = self.parse(requires).node
+            if isinstance(node, And):
+                operands = [operand for operand in node.operands if not self.is_folded_true(operand, area)]
+                if len(operands) != 1:
+                    return None
+                node = operands[0]
+
+            if isinstance(node, ItemRequirement):
+                key = node.name
+            elif isinstance(node, CategoryRequirement) and self.world.category_name_to_item_names.get(node.name):
+                key = self.world.category_state_keys.get(node.name)
+            else:
+                return None
+
+            count = _parse_count(node.count, allow_negative=True)
+        except RequiresCompileError:
+            return None
+
+        if key is None or not isinstance(count, int) or count < 1:
+            return None
+        return key, count
+
+    def is_folded_true(self, node: RequiresNode, area: dict) -> bool:
+        if not isinstance(node, FunctionCall):
+            return False
+        func = self.get_function(node.name)
+        return callable(func) and is_state_independent(func) and self.run_state_independent(node, area) is True
+
+    def node_dependencies(self, node: RequiresNode, area: dict) -> set[str]:
+        if isinstance(node, ItemRequirement):
+            return {node.name}
+        if isinstance(node, CategoryRequirement):
+            return set(self.world.category_name_to_item_names.get(node.name, ()))
+        if isinstance(node, FunctionCall):
+            func = self.get_function(node.name)
+            if callable(func) and is_state_independent(func) and isinstance(self.run_state_independent(node, area), bool):
+                return set()
+            raise RequiresCompileError(f"Function {node.name} can depend on anything")
+        if isinstance(node, Not):
+            return self.node_dependencies(node.operand, area)
+        if isinstance(node, (And, Or)):
+            return set().union(*(self.node_dependencies(operand, area) for operand in node.operands))
+        return set()
+
+    def lower(self, node: RequiresNode, calls: _FunctionCalls) -> Rule:
+        if isinstance(node, Constant):
+            return _constant_rule(node.value)
+        if isinstance(node, ItemRequirement):
+            return self.lower_item(node)
+        if isinstance(node, CategoryRequirement):
+            return self.lower_category(node)
+        if isinstance(node, FunctionCall):
+            return self.lower_function(node, calls)
+        if isinstance(node, Not):
+            operand = self.lower(node.operand, calls)
+            if operand is always_true or operand is always_false:
+                return _constant_rule(operand is always_false)
+            return lambda state: not operand(state)
+        if isinstance(node, And):
+            return _all_of([self.lower(operand, calls) for operand in node.operands])
+        if isinstance(node, Or):
+            return _any_of([self.lower(operand, calls) for operand in node.operands])
+        raise RequiresCompileError(f"Unknown node {node!r}")
+
+    def lower_item(self, node: ItemRequirement) -> Rule:
+        player = self.player
+        name = node.name
+        count = _parse_count(node.count, allow_negative=True)
+
+        if isinstance(count, int):
+            return lambda state: state.has(name, player, count)
+
+        threshold = self.pool_threshold(count, (name,))
+        return lambda state: state.count(name, player) >= threshold()
+
+    def lower_category(self, node: CategoryRequirement) -> Rule:
+        player = self.player
+        count = _parse_count(node.count, allow_negative=False)
+        category_items = tuple(self.world.category_name_to_item_names.get(node.name, ()))
+
+        # the interpreter never considers a category with no items to be satisfied, not even for a count of 0
+        if not category_items:
+            return always_false
+
+        # the category's total is kept up to date in the state by ManualWorld.collect/remove
+        category_key = self.world.category_state_keys.get(node.name)
+
+        if category_key is not None:
+            if isinstance(count, int):
+                return lambda state: state.has(category_key, player, count)
+
+            threshold = self.pool_threshold(count, category_items)
+            return lambda state: state.count(category_key, player) >= threshold()
+
+        if isinstance(count, int):
+            def category_rule(state: CollectionState) -> bool:
+                total = 0
+                for item_name in category_items:
+                    total += state.count(item_name, player)
+                    if total >= count:
+                        return True
+                return False
+
+            return category_rule
+
+        threshold = self.pool_threshold(count, category_items)
+        return lambda state: sum(state.count(item_name, player) for item_name in category_items) >= threshold()
+
+    def pool_threshold(self, count: Callable[[int], int], item_names: tuple[str, ...]) -> Callable[[], int]:
+        """Return a function giving the count needed for an all/half/% requirement on the given items.\n
+        The pool counts are frozen once create_items is done, so the count is only computed again if the world's counts get replaced (eg. by a hook)."""
+        world = self.world
+        player = self.player
+        resolved_from = None
+        resolved = 0
+
+        def threshold() -> int:
+            nonlocal resolved_from, resolved
+            items_counts = world.get_item_counts(player, only_progression=True)
+            if items_counts is not resolved_from:
+                resolved_from = items_counts
+                resolved = count(sum(items_counts.get(item_name, 0) for item_name in item_names))
+            return resolved
+
+        return threshold
+
+    def lower_function(self, node: FunctionCall, calls: _FunctionCalls) -> Rule:
+        if node in calls.folded:
+            return _constant_rule(calls.folded[node])
+
+        index = calls.indexes[node]
+        results = calls.results
+        return lambda state: results[-1][index]
+
+def _merge_counts(items: tuple[tuple[str, int], ...]) -> dict[str, int]:
+    # needing an item twice means needing the highest of the two counts
+    counts = {}
+    for item_name, count in items:
+        counts[item_name] = max(counts.get(item_name, count), count)
+    return counts
+
+def _merge_clauses(first: dict[str, int], second: dict[str, int]) -> dict[str, int]:
+    merged = dict(first)
+    for key, count in second.items():
+        merged[key] = max(merged.get(key, count), count)
+    return merged
+
+def node_text(node: RequiresNode) -> str:
+    """Write the node back as a requires string"""
+    if isinstance(node, Constant):
+        return "{true}" if node.value else "{false}"
+    if isinstance(node, FunctionCall):
+        return f"{{{node.name}({node.args})}}"
+    if isinstance(node, Not):
+        return f"!{_operand_text(node.operand)}"
+    if isinstance(node, (And, Or)):
+        operator = " and " if isinstance(node, And) else " or "
+        return operator.join(_operand_text(operand) for operand in node.operands)
+
+    prefix = "@" if isinstance(node, CategoryRequirement) else ""
+    return f"|{prefix}{node.name}|" if node.count == "1" else f"|{prefix}{node.name}:{node.count}|"
+
+def _operand_text(node: RequiresNode) -> str:
+    return f"({node_text(node)})" if isinstance(node, (And, Or)) else node_text(node)
+
+def is_monotone(node: RequiresNode) -> bool:
+    """Is the node made only of items and categories combined with and/or, so getting more items can never make it False"""
+    if isinstance(node, (And, Or)):
+        return all(is_monotone(operand) for operand in node.operands)
+    return isinstance(node, (ItemRequirement, CategoryRequirement))
+
+def node_key(node: RequiresNode) -> tuple:
+    """A hashable key that is the same for requires with the same AST, whatever their spacing or the case of their AND/OR"""
+    if isinstance(node, (Not, And, Or)):
+        operands = (node.operand,) if isinstance(node, Not) else node.operands
+        return (type(node).__name__,) + tuple(node_key(operand) for operand in operands)
+    if isinstance(node, Constant):
+        return ("Constant", node.value)
+    if isinstance(node, FunctionCall):
+        return ("FunctionCall", node.name, node.args)
+    return (type(node).__name__, node.name, node.count)
+
+def function_calls(node: RequiresNode) -> list[FunctionCall]:
+    """Every function call of the requires, in the order the interpreter runs them"""
+    if isinstance(node, FunctionCall):
+        return [node]
+    if isinstance(node, Not):
+        return function_calls(node.operand)
+    if isinstance(node, (And, Or)):
+        return [call for operand in node.operands for call in function_calls(operand)]
+    return []
+
+def _parse_count(item_count: str, allow_negative: bool):
+    """Return the count as an int, or as a function of the pool count for 'all', 'half' and percentages"""
+    if item_count.lower() == 'all':
+        return lambda pool_count: pool_count
+    if item_count.lower() == 'half':
+        return lambda pool_count: int(pool_count / 2)
+    if item_count.endswith('%') and len(item_count) > 1:
+        try:
+            percent = clamp(float(item_count[:-1]) / 100, 0, 1)
+        except ValueError as e:
+            raise RequiresCompileError(f"Invalid percentage {item_count}") from e
+        return lambda pool_count: math.ceil(pool_count * percent)
+
+    try:
+        count = int(item_count)
+    except ValueError as e:
+        raise RequiresCompileError(f"Invalid count {item_count}") from e
+
+    if count < 0 and not allow_negative:
+        raise RequiresCompileError(f"Negative count {item_count}")
+    return count
+
+def always_true(state: CollectionState) -> bool:
+    return True
+
+def always_false(state: CollectionState) -> bool:
+    return False
+
+def _constant_rule(value: bool) -> Rule:
+    return always_true if value else always_false
+
+def _all_of(rules: list[Rule]) -> Rule:
+    if any(rule is always_false for rule in rules):
+        return always_false
+    rules = [rule for rule in rules if rule is not always_true]
+
+    if not rules:
+        return always_true
+    if len(rules) == 1:
+        return rules[0]
+    if len(rules) == 2:
+        first, second = rules
+        return lambda state: first(state) and second(state)
+
+    rules = tuple(rules)
+
+    def all_rule(state: CollectionState) -> bool:
+        for rule in rules:
+            if not rule(state):
+                return False
+        return True
+
+    return all_rule
+
+def _any_of(rules: list[Rule]) -> Rule:
+    if any(rule is always_true for rule in rules):
+        return always_true
+    rules = [rule for rule in rules if rule is not always_false]
+
+    if not rules:
+        return always_false
+    if len(rules) == 1:
+        return rules[0]
+    if len(rules) == 2:
+        first, second = rules
+        return lambda state: first(state) or second(state)
+
+    rules = tuple(rules)
+
+    def any_rule(state: CollectionState) -> bool:
+        for rule in rules:
+            if rule(state):
+                return True
+        return False
+
+    return any_rule
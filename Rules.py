@@ -1,13 +1,18 @@
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Callable, Optional
 from enum import IntEnum
 from operator import eq, ge, le
 
 from .Regions import regionMap
+from .RequiresCompiler import RequiresCompiler, RequiresCompileError, RequiresNode, CountThresholds, ItemRequirement, And, Or, \
+    always_true, always_false, function_calls, is_monotone, node_key, node_text
+from .Locations import ManualLocation
+from .Items import ManualItem
+from .BatchRules import BatchRulesEvaluator
 from .hooks import Rules
 from .Helpers import clamp, is_item_enabled, is_option_enabled, get_option_value, convert_string_to_type,\
-    format_to_valid_identifier, format_state_prog_items_key, ProgItemsCat
+    format_to_valid_identifier, format_state_prog_items_key, ProgItemsCat, state_independent, get_state_cache
 
-from BaseClasses import MultiWorld, CollectionState
+from BaseClasses import MultiWorld, CollectionState, ItemClassification
 from worlds.AutoWorld import World
 from worlds.generic.Rules import set_rule, add_rule
 from Options import Choice, Toggle, Range, NamedRange
@@ -16,6 +21,7 @@ import re
 import math
 import inspect
 import logging
+from collections import Counter
 
 if TYPE_CHECKING:
     from . import ManualWorld
@@ -102,6 +108,77 @@ def evaluate_postfix(expr: str, location: str) -> bool:
     return stack.pop()
 
 def set_rules(world: "ManualWorld", multiworld: MultiWorld, player: int):
+    # find a requirement function by name, first in this file then in the Rules hooks
+    def getRequireFunction(func_name: str):
+        func = globals().get(func_name)
+
+        if func is None:
+            func = getattr(Rules, func_name, None)
+
+        return func
+
+    # The arguments of each {function(args)} only get converted the first time it's called,
+    # afterward the cached list is reused with the state put back in place of the placeholder
+    statePlaceholder = object()
+    boundRequireFunctions: dict[tuple[str, str], tuple[Callable, list, tuple[int, ...]]] = {}
+
+    # run a single {function(args)} found in a requires and return its raw result, state is None when folding a @state_independent function
+    def runRequireFunction(state: Optional[CollectionState], area: dict, func_name: str, func_args_text: str):
+        area_type = "region" if area.get("is_region",False) else "location"
+        area_name = area.get("name", f"unknown with these parameters: {area}")
+
+        bound = boundRequireFunctions.get((func_name, func_args_text))
+        if bound is None:
+            func_args = func_args_text.split(",")
+            if func_args == ['']:
+                func_args.pop()
+
+            func = getRequireFunction(func_name)
+
+            if not callable(func):
+                raise ValueError(f'Invalid function "{func_name}" in {area_type} "{area_name}".')
+
+            convert_req_function_args(statePlaceholder, func, func_args, area_name)
+            state_indexes = tuple(i for i, arg in enumerate(func_args) if arg is statePlaceholder)
+            bound = boundRequireFunctions[(func_name, func_args_text)] = (func, func_args, state_indexes)
+
+        func, func_args, state_indexes = bound
+        if world.rules_profiler:
+            world.rules_profiler.record_function(func_name)
+        if state_indexes:
+            func_args = func_args.copy()
+            for i in state_indexes:
+                func_args[i] = state
+
+        try:
+            return func(*func_args)
+        except Exception as ex:
+            raise RuntimeError(f'A call to the function "{func_name}" in {area_type} "{area_name}"\'s requires raised an Exception. \
+                                \nUnless it was called by another function, it should look something like "{{{func_name}({func_args_text})}}" in {area_type}s.json. \
+                                \nFull error message: \
+                                \n\n{type(ex).__name__}: {ex}')
+
+    # all/half/% counts only depend on the pool counts, so they are resolved once per item/category
+    # and only resolved again if the counts get replaced (eg. by a hook setting world.item_counts_progression)
+    resolvedPoolCounts: dict[tuple[str, str, str], int] = {}
+    resolvedFromItemsCounts = [None]
+    def resolvePoolCount(items_counts: Counter[str], require_type: str, item_name: str, item_count: str, item_names) -> int:
+        if resolvedFromItemsCounts[0] is not items_counts:
+            resolvedFromItemsCounts[0] = items_counts
+            resolvedPoolCounts.clear()
+
+        key = (require_type, item_name, item_count)
+        if key not in resolvedPoolCounts:
+            pool_count = sum(items_counts.get(name, 0) for name in item_names)
+            if item_count.lower() == 'all':
+                resolvedPoolCounts[key] = pool_count
+            elif item_count.lower() == 'half':
+                resolvedPoolCounts[key] = int(pool_count / 2)
+            else:
+                percent = clamp(float(item_count[:-1]) / 100, 0, 1)
+                resolvedPoolCounts[key] = math.ceil(pool_count * percent)
+        return resolvedPoolCounts[key]
+
     # this is only called when the area (think, location or region) has a "requires" field that is a string
     def checkRequireStringForArea(state: CollectionState, area: dict):
         requires_list = area["requires"]
@@ -126,26 +203,7 @@ def set_rules(world: "ManualWorld", multiworld: MultiWorld, player: int):
                 else:
                     for item in found_functions:
                         func_name = item[0]
-                        func_args = item[1].split(",")
-                        if func_args == ['']:
-                            func_args.pop()
-
-                        func = globals().get(func_name)
-
-                        if func is None:
-                            func = getattr(Rules, func_name, None)
-
-                        if not callable(func):
-                            raise ValueError(f'Invalid function "{func_name}" in {area_type} "{area_name}".')
-
-                        convert_req_function_args(state, func, func_args, area_name)
-                        try:
-                            result = func(*func_args)
-                        except Exception as ex:
-                            raise RuntimeError(f'A call to the function "{func_name}" in {area_type} "{area_name}"\'s requires raised an Exception. \
-                                                \nUnless it was called by another function, it should look something like "{{{func_name}({item[1]})}}" in {area_type}s.json. \
-                                                \nFull error message: \
-                                                \n\n{type(ex).__name__}: {ex}')
+                        result = runRequireFunction(state, area, func_name, item[1])
                         if isinstance(result, bool):
                             requires_list = requires_list.replace("{" + func_name + "(" + item[1] + ")}", "1" if result else "0")
                         else:
@@ -178,35 +236,31 @@ def set_rules(world: "ManualWorld", multiworld: MultiWorld, player: int):
             total = 0
 
             if require_type == 'category':
-                category_items = [item for item in world.item_name_to_item.values() if "category" in item and item_name in item["category"]]
-                category_items_counts = sum([items_counts.get(category_item["name"], 0) for category_item in category_items])
-                if item_count.lower() == 'all':
-                    item_count = category_items_counts
-                elif item_count.lower() == 'half':
-                    item_count = int(category_items_counts / 2)
-                elif item_count.endswith('%') and len(item_count) > 1:
-                    percent = clamp(float(item_count[:-1]) / 100, 0, 1)
-                    item_count = math.ceil(category_items_counts * percent)
+                category_items = world.category_name_to_item_names.get(item_name, frozenset())
+                if item_count.lower() in ('all', 'half') or (item_count.endswith('%') and len(item_count) > 1):
+                    item_count = resolvePoolCount(items_counts, require_type, item_name, item_count, category_items)
                 else:
                     try:
                         item_count = int(item_count)
                     except ValueError as e:
                         raise ValueError(f"Invalid item count `{item_name}` in {area}.") from e
 
-                for category_item in category_items:
-                    total += state.count(category_item["name"], player)
+                category_key = world.category_state_keys.get(item_name)
+                if category_key is not None:
+                    # the category's total is kept up to date in the state by ManualWorld.collect/remove
+                    total = state.count(category_key, player)
 
-                    if total >= item_count:
+                    if category_items and total >= item_count:
                         requires_list = requires_list.replace(item_base, "1")
+                else:
+                    for category_item in category_items:
+                        total += state.count(category_item, player)
+
+                        if total >= item_count:
+                            requires_list = requires_list.replace(item_base, "1")
             elif require_type == 'item':
-                item_current_count = items_counts.get(item_name, 0)
-                if item_count.lower() == 'all':
-                    item_count = item_current_count
-                elif item_count.lower() == 'half':
-                    item_count = int(item_current_count / 2)
-                elif item_count.endswith('%') and len(item_count) > 1:
-                    percent = clamp(float(item_count[:-1]) / 100, 0, 1)
-                    item_count = math.ceil(item_current_count * percent)
+                if item_count.lower() in ('all', 'half') or (item_count.endswith('%') and len(item_count) > 1):
+                    item_count = resolvePoolCount(items_counts, require_type, item_name, item_count, (item_name,))
                 else:
                     item_count = int(item_count)
 
@@ -261,7 +315,8 @@ def set_rules(world: "ManualWorld", multiworld: MultiWorld, player: int):
                     item_name = item_parts[0]
                     item_count = int(item_parts[1])
 
-                if not state.has(item_name, player, item_count):
+                # once an item is missing only an or-group can still make it accessible
+                if canAccess and not state.has(item_name, player, item_count):
                     canAccess = False
 
         return canAccess
@@ -281,66 +336,6 @@ def set_rules(world: "ManualWorld", multiworld: MultiWorld, player: int):
         else:  # item access is in dict form
             return checkRequireDictForArea(state, area)
 
-    used_location_names = []
-    # Region access rules
-    for region in regionMap.keys():
-        used_location_names.extend([l.name for l in multiworld.get_region(region, player).locations])
-        if region != "Menu":
-            for exitRegion in multiworld.get_region(region, player).entrances:
-                def fullRegionCheck(state: CollectionState, region=regionMap[region], region_name=exitRegion.name):
-                    region['name'] = region_name
-                    region['is_region'] = True
-
-                    return fullLocationOrRegionCheck(state, region)
-
-                add_rule(world.get_entrance(exitRegion.name), fullRegionCheck)
-            entrance_rules = regionMap[region].get("entrance_requires", {})
-            for e in entrance_rules:
-                entrance = world.get_entrance(f'{e}To{region}')
-                add_rule(entrance, lambda state, rule={"requires": entrance_rules[e]}: fullLocationOrRegionCheck(state, rule))
-            exit_rules = regionMap[region].get("exit_requires", {})
-            for e in exit_rules:
-                exit = world.get_entrance(f'{region}To{e}')
-                add_rule(exit, lambda state, rule={"requires": exit_rules[e]}: fullLocationOrRegionCheck(state, rule))
-
-    # Location access rules
-    for location in world.location_table:
-        if location["name"] not in used_location_names:
-            continue
-
-        locFromWorld = multiworld.get_location(location["name"], player)
-
-        locationRegion = regionMap[location["region"]] if "region" in location else None
-
-        if locationRegion:
-            locationRegion['name'] = location['region']
-            locationRegion['is_region'] = True
-
-        if "requires" in location: # Location has requires, check them alongside the region requires
-            def checkBothLocationAndRegion(state: CollectionState, location=location, region=locationRegion):
-                locationCheck = fullLocationOrRegionCheck(state, location)
-                regionCheck = True # default to true unless there's a region with requires
-
-                if region:
-                    regionCheck = fullLocationOrRegionCheck(state, region)
-
-                return locationCheck and regionCheck
-
-            set_rule(locFromWorld, checkBothLocationAndRegion)
-        elif "region" in location: # Only region access required, check the location's region's requires
-            def fullRegionCheck(state, region=locationRegion):
-                return fullLocationOrRegionCheck(state, region)
-
-            set_rule(locFromWorld, fullRegionCheck)
-        else: # No location region and no location requires? It's accessible.
-            def allRegionsAccessible(state):
-                return True
-
-            set_rule(locFromWorld, allRegionsAccessible)
-
-    # Victory requirement
-    multiworld.completion_condition[player] = lambda state: state.has("__Victory__", player)
-
     def convert_req_function_args(state: CollectionState, func, args: list[str], areaName: str):
         parameters = inspect.signature(func).parameters
         knownParameters = [World, 'ManualWorld', MultiWorld, CollectionState]
@@ -387,6 +382,258 @@ def set_rules(world: "ManualWorld", multiworld: MultiWorld, player: int):
 
             args[index] = value
 
+    requires_compiler = RequiresCompiler(world, player, getRequireFunction, runRequireFunction, fullLocationOrRegionCheck)
+
+    # compile the requires of an area once, returns None when it has to be interpreted on every check instead
+    def compileLocationOrRegionCheck(area: dict) -> Optional[Callable[[CollectionState], bool]]:
+        if not world.rules_compile_requires:
+            return None
+
+        if not area or "requires" not in area.keys():
+            return always_true
+
+        return requires_compiler.compile(area)
+
+    compiled_region_checks = {}
+    def getCompiledRegionCheck(region_name: str) -> Optional[Callable[[CollectionState], bool]]:
+        if region_name not in compiled_region_checks:
+            region = regionMap[region_name]
+            region['name'] = region_name
+            region['is_region'] = True
+            compiled_region_checks[region_name] = compileLocationOrRegionCheck(region)
+        return compiled_region_checks[region_name]
+
+    # Index of which locations/entrances reference each item in their requires, used by ManualWorld.get_locations_affected_by_item
+    item_name_to_dependent_locations: dict[str, set[str]] = {}
+    item_name_to_dependent_entrances: dict[str, set[str]] = {}
+    unindexed_locations: set[str] = set() # their requires use something that can't be indexed, like a function
+    unindexed_entrances: set[str] = set()
+
+    def addRuleDependencies(name: str, area: dict, item_name_to_dependents: dict[str, set[str]], unindexed: set[str]):
+        dependencies = requires_compiler.dependencies(area)
+        if dependencies is None:
+            unindexed.add(name)
+            return
+
+        for item_name in dependencies:
+            item_name_to_dependents.setdefault(item_name, set()).add(name)
+
+    # Locations whose requires is a single |Item:N| or |@Category:N|, grouped by what they count, see ManualWorld.get_count_threshold_locations_met
+    count_thresholds: dict[str, list[tuple[int, str]]] = {}
+
+    # Each location's requires as clauses for the BatchRulesEvaluator, along with the rule they match
+    location_clauses: dict[str, Optional[list[dict[str, int]]]] = {}
+    location_rules: dict[str, Callable[[CollectionState], bool]] = {}
+
+    used_location_names = set()
+    # Region access rules
+    for region in regionMap.keys():
+        used_location_names.update(l.name for l in multiworld.get_region(region, player).locations)
+        if region != "Menu":
+            compiledRegionCheck = getCompiledRegionCheck(region)
+            for exitRegion in multiworld.get_region(region, player).entrances:
+                addRuleDependencies(exitRegion.name, regionMap[region], item_name_to_dependent_entrances, unindexed_entrances)
+                if compiledRegionCheck is always_true: # the region's requires folded away, nothing to check
+                    continue
+
+                def fullRegionCheck(state: CollectionState, region=regionMap[region]):
+                    return fullLocationOrRegionCheck(state, region)
+
+                add_rule(world.get_entrance(exitRegion.name), compiledRegionCheck or fullRegionCheck)
+            entrance_rules = regionMap[region].get("entrance_requires", {})
+            for e in entrance_rules:
+                entrance = world.get_entrance(f'{e}To{region}')
+                rule = {"requires": entrance_rules[e]}
+                addRuleDependencies(entrance.name, rule, item_name_to_dependent_entrances, unindexed_entrances)
+                compiledRule = compileLocationOrRegionCheck(rule)
+                if compiledRule is not always_true:
+                    add_rule(entrance, compiledRule or (lambda state, rule=rule: fullLocationOrRegionCheck(state, rule)))
+            exit_rules = regionMap[region].get("exit_requires", {})
+            for e in exit_rules:
+                exit = world.get_entrance(f'{region}To{e}')
+                rule = {"requires": exit_rules[e]}
+                addRuleDependencies(exit.name, rule, item_name_to_dependent_entrances, unindexed_entrances)
+                compiledRule = compileLocationOrRegionCheck(rule)
+                if compiledRule is not always_true:
+                    add_rule(exit, compiledRule or (lambda state, rule=rule: fullLocationOrRegionCheck(state, rule)))
+
+    # Turn the and/or parts of requires shared by enough locations into events, so sweeps evaluate each of them once per player instead of once per location
+    def extractCommonRequires(minimum_uses: int) -> dict[str, RequiresNode]:
+        location_nodes: dict[str, RequiresNode] = {}
+        for location in world.location_table:
+            if location["name"] not in used_location_names or not isinstance(location.get("requires"), str):
+                continue
+            try:
+                node = requires_compiler.fold(requires_compiler.parse(location["requires"]).node, location)
+            except RequiresCompileError:
+                continue
+            if not function_calls(node):
+                location_nodes[location["name"]] = node
+
+        # only the parts that more items can't make False, and not under a !, since an event stays collected once it's True
+        subtrees: dict[tuple, RequiresNode] = {}
+        def findSubtrees(node: RequiresNode, found: set):
+            if isinstance(node, (And, Or)):
+                if is_monotone(node):
+                    key = node_key(node)
+                    subtrees.setdefault(key, node)
+                    found.add(key)
+                for operand in node.operands:
+                    findSubtrees(operand, found)
+
+        uses = Counter()
+        for node in location_nodes.values():
+            found = set()
+            findSubtrees(node, found)
+            uses.update(found)
+
+        def rewrite(node: RequiresNode, events: dict[tuple, str], event_uses: Counter) -> RequiresNode:
+            if isinstance(node, (And, Or)):
+                event_name = events.get(node_key(node))
+                if event_name:
+                    event_uses[event_name] += 1
+                    return ItemRequirement(event_name, "1")
+                return type(node)(tuple(rewrite(operand, events, event_uses) for operand in node.operands))
+            return node
+
+        # the outermost shared part wins, which can leave the parts inside it used by too few locations to be worth an event
+        chosen = {key for key, count in uses.items() if count >= minimum_uses}
+
+        # compile the events' rules first, a part that can't be compiled can't be an event and mustn't be rewritten into one
+        event_rules: dict[tuple, Callable[[CollectionState], bool]] = {}
+        for key in chosen:
+            try:
+                event_rules[key] = requires_compiler.compile_node(subtrees[key])
+            except RequiresCompileError:
+                pass
+        chosen = set(event_rules)
+
+        while True:
+            events = {key: f"__Requires__ {node_text(subtrees[key])}" for key in chosen}
+            event_uses = Counter()
+            rewritten = {name: rewrite(node, events, event_uses) for name, node in location_nodes.items()}
+            unused = {key for key in chosen if event_uses[events[key]] < minimum_uses}
+            if not unused:
+                break
+            chosen -= unused
+
+        if not chosen:
+            return {}
+
+        manual_region = multiworld.get_region("Manual", player)
+        for key in chosen:
+            event_location = ManualLocation(player, events[key], None, manual_region)
+            event_location.place_locked_item(ManualItem(events[key], ItemClassification.progression, None, player=player))
+            set_rule(event_location, event_rules[key])
+            manual_region.locations.append(event_location)
+            world.register_location(event_location)
+            world.common_requires_events[events[key]] = [name for name, node in rewritten.items() if events[key] in _requirementNames(node)]
+
+        saved = sum(len(location_names) for location_names in world.common_requires_events.values()) - len(world.common_requires_events)
+        logging.info(f"{world.game}: {player} ({multiworld.get_player_name(player)}) shared {len(world.common_requires_events)} common requires as events, "
+                     f"saving {saved} requires evaluations per sweep")
+
+        return {name: node for name, node in rewritten.items()
+                if any(event_name in world.common_requires_events for event_name in _requirementNames(node))}
+
+    world.common_requires_events = {}
+    extracted_location_requires: dict[str, RequiresNode] = {}
+    if world.rules_compile_requires and world.rules_extract_common_requires > 0:
+        extracted_location_requires = extractCommonRequires(world.rules_extract_common_requires)
+
+    # The region checks used by location rules when rules_locations_check_region is True, cached on the state
+    location_region_checks = {}
+    def getLocationRegionCheck(region_name: str) -> Callable[[CollectionState], bool]:
+        if region_name not in location_region_checks:
+            region = regionMap[region_name]
+            check = getCompiledRegionCheck(region_name) or (lambda state, region=region: fullLocationOrRegionCheck(state, region))
+            requires = region.get("requires")
+
+            # functions like canReachLocation can change result without the player's items changing, so those aren't cached
+            if check is not always_true and check is not always_false and not (isinstance(requires, str) and "{" in requires):
+                def cachedRegionCheck(state: CollectionState, region_name=region_name, check=check):
+                    cache = get_state_cache(state, player, "region_checks")
+                    result = cache.get(region_name)
+                    if result is None:
+                        result = cache[region_name] = check(state)
+                    return result
+
+                check = cachedRegionCheck
+
+            location_region_checks[region_name] = check
+        return location_region_checks[region_name]
+
+    # Location access rules
+    for location in world.location_table:
+        if location["name"] not in used_location_names:
+            continue
+
+        locFromWorld = world.get_location(location["name"])
+
+        locationRegion = regionMap[location["region"]] if "region" in location else None
+
+        if locationRegion:
+            locationRegion['name'] = location['region']
+            locationRegion['is_region'] = True
+
+        addRuleDependencies(location["name"], location, item_name_to_dependent_locations, unindexed_locations)
+        for event_name in _requirementNames(extracted_location_requires.get(location["name"])):
+            item_name_to_dependent_locations.setdefault(event_name, set()).add(location["name"])
+        if locationRegion and world.rules_locations_check_region:
+            addRuleDependencies(location["name"], locationRegion, item_name_to_dependent_locations, unindexed_locations)
+
+        threshold = requires_compiler.count_threshold(location)
+        if threshold:
+            count_thresholds.setdefault(threshold[0], []).append((threshold[1], location["name"]))
+
+        locationCheck = always_true
+        if location["name"] in extracted_location_requires:
+            locationCheck = requires_compiler.compile_node(extracted_location_requires[location["name"]])
+        elif "requires" in location:
+            locationCheck = compileLocationOrRegionCheck(location) or (lambda state, location=location: fullLocationOrRegionCheck(state, location))
+
+        # the entrances into the region already check its requires, unless asked to the location doesn't check them again
+        regionCheck = always_true
+        if locationRegion and world.rules_locations_check_region:
+            regionCheck = getLocationRegionCheck(location["region"])
+
+        # requires that folded down to a constant don't need to be checked at all
+        if locationCheck is always_false or regionCheck is always_false:
+            set_rule(locFromWorld, always_false)
+        elif regionCheck is always_true:
+            if locationCheck is not always_true:
+                set_rule(locFromWorld, locationCheck)
+        elif locationCheck is always_true:
+            set_rule(locFromWorld, regionCheck)
+        else:
+            def checkBothLocationAndRegion(state: CollectionState, location_check=locationCheck, region_check=regionCheck):
+                return location_check(state) and region_check(state)
+
+            set_rule(locFromWorld, checkBothLocationAndRegion)
+
+        uses_events = location["name"] in extracted_location_requires
+        location_clauses[location["name"]] = requires_compiler.dnf(location) if regionCheck is always_true and not uses_events else None
+        location_rules[location["name"]] = locFromWorld.access_rule
+
+    world.item_name_to_dependent_locations = item_name_to_dependent_locations
+    world.item_name_to_dependent_entrances = item_name_to_dependent_entrances
+    world.unindexed_locations = unindexed_locations
+    world.unindexed_entrances = unindexed_entrances
+    world.locations_affected_by_item = {}
+    world.count_thresholds = {key: CountThresholds(key, thresholds) for key, thresholds in count_thresholds.items()}
+    world.batch_rules = BatchRulesEvaluator(multiworld, player, location_clauses, location_rules)
+
+    # Victory requirement
+    multiworld.completion_condition[player] = lambda state: state.has("__Victory__", player)
+
+
+def _requirementNames(node: Optional[RequiresNode]) -> set[str]:
+    """Names of the items required directly by the node, used to find which events a rewritten requires uses"""
+    if isinstance(node, ItemRequirement):
+        return {node.name}
+    if isinstance(node, (And, Or)):
+        return set().union(*(_requirementNames(operand) for operand in node.operands))
+    return set()
 
 def ItemValue(state: CollectionState, player: int, valueCount: str):
     """When passed a string with this format: 'valueName:int',
@@ -431,8 +678,8 @@ def OptOne(world: "ManualWorld", item: str, items_counts: Optional[dict] = None)
     if require_type == 'category':
         if item_count.isnumeric():
             #Only loop if we can use the result to clamp
-            category_items = [item for item in world.item_name_to_item.values() if "category" in item and item_name in item["category"]]
-            category_items_counts = sum([items_counts.get(category_item["name"], 0) for category_item in category_items])
+            category_items = world.category_name_to_item_names.get(item_name, frozenset())
+            category_items_counts = sum([items_counts.get(category_item, 0) for category_item in category_items])
             item_count = clamp(int(item_count), 0, category_items_counts)
         return f"|@{item_name}:{item_count}|"
     elif require_type == 'item':
@@ -471,18 +718,35 @@ def OptAll(world: "ManualWorld", requires: str):
 # Rule to expose the can_reach_location core function
 def canReachLocation(state: CollectionState, player: int, location: str):
     """Can the player reach the given location?"""
+    # The answers are cached on the state until the player's items change, so nested {canReachLocation()} don't redo the work.
+    # A True answer can't change until then, a False one can while the reachable regions are still being updated.
+    cache = get_state_cache(state, player, "can_reach_location")
+    cached = cache.get(location)
+    if cached is True:
+        return True
+
+    if cached is not None and not state.stale[player] and cached == len(state.reachable_regions[player]):
+        return False
+
     if state.can_reach_location(location, player):
+        cache[location] = True
         return True
+
+    # remember how many regions were reachable when it wasn't, it stays False for as long as that doesn't change
+    cache[location] = len(state.reachable_regions[player])
     return False
 
+@state_independent
 def YamlEnabled(multiworld: MultiWorld, player: int, param: str) -> bool:
     """Is a yaml option enabled?"""
     return is_option_enabled(multiworld, player, param)
 
+@state_independent
 def YamlDisabled(multiworld: MultiWorld, player: int, param: str) -> bool:
     """Is a yaml option disabled?"""
     return not is_option_enabled(multiworld, player, param)
 
+@state_independent
 def YamlCompare(world: "ManualWorld", multiworld: MultiWorld, state: CollectionState, player: int, args: str, skipCache: bool = False) -> bool:
     """Is a yaml option's value compared using {comparator} to the requested value
     \nFormat it like {YamlCompare(OptionName==value)}
@@ -0,0 +1,75 @@
+import os
+from collections import Counter
+from time import perf_counter_ns
+from typing import Callable
+
+from BaseClasses import CollectionState
+
+# Set this environment variable to anything but "" or "0" to profile the rules of every Manual world, same as ManualWorld.rules_profile = True
+PROFILE_ENV_VAR = "MANUAL_PROFILE_RULES"
+
+def is_profiling_enabled_by_env() -> bool:
+    return os.environ.get(PROFILE_ENV_VAR, "") not in ("", "0")
+
+
+class RuleStats:
+    __slots__ = ("kind", "name", "calls", "true", "false", "nanoseconds", "functions")
+
+    def __init__(self, kind: str, name: str):
+        self.kind = kind
+        self.name = name
+        self.calls = 0
+        self.true = 0
+        self.false = 0
+        self.nanoseconds = 0
+        self.functions: Counter[str] = Counter()
+
+class RulesProfiler:
+    """Wraps access rules to count their calls and results and time them.\n
+    Times are cumulative: a rule that evaluates another one (eg. with canReachLocation) includes the time of that other rule."""
+    def __init__(self):
+        self.stats: dict[tuple[str, str], RuleStats] = {}
+        self.running: list[RuleStats] = []
+
+    def wrap(self, kind: str, name: str, rule: Callable[[CollectionState], bool]) -> Callable[[CollectionState], bool]:
+        stats = self.stats.setdefault((kind, name), RuleStats(kind, name))
+        running = self.running
+
+        def profiled_rule(state: CollectionState) -> bool:
+            running.append(stats)
+            start = perf_counter_ns()
+            try:
+                result = rule(state)
+            finally:
+                stats.nanoseconds += perf_counter_ns() - start
+                running.pop()
+
+            stats.calls += 1
+            if result:
+                stats.true += 1
+            else:
+                stats.false += 1
+            return result
+
+        return profiled_rule
+
+    def record_function(self, func_name: str):
+        """Count a {function()} call for the rule currently being evaluated, calls made while setting the rules aren't counted"""
+        if self.running:
+            self.running[-1].functions[func_name] += 1
+
+    def write_report(self, path: str, title: str):
+        """Write every rule's stats to path, the slowest first"""
+        stats = sorted(self.stats.values(), key=lambda s: (-s.nanoseconds, s.kind, s.name))
+        total_nanoseconds = sum(s.nanoseconds for s in stats)
+
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f"{title}\n")
+            f.write(f"{len(stats)} rules, {sum(s.calls for s in stats)} calls, {total_nanoseconds / 1_000_000:.3f} ms in total (nested rules are counted in their caller too)\n\n")
+            f.write(f"{'total ms':>10} {'avg us':>9} {'calls':>9} {'true':>9} {'false':>9}  {'kind':<9} name / functions called\n")
+            for s in stats:
+                average = s.nanoseconds / s.calls / 1000 if s.calls else 0
+                f.write(f"{s.nanoseconds / 1_000_000:>10.3f} {average:>9.2f} {s.calls:>9} {s.true:>9} {s.false:>9}  {s.kind:<9} {s.name}\n")
+                if s.functions:
+                    functions = ", ".join(f"{func_name} x{count}" for func_name, count in s.functions.most_common())
+                    f.write(f"{'':>51}  {'':<9}   {functions}\n")
@@ -2,7 +2,7 @@ from base64 import b64encode
 import logging
 import os
 import json
-from typing import Callable, Optional, Counter
+from typing import TYPE_CHECKING, Callable, Iterable, Optional, Counter
 import webbrowser
 
 import Utils
@@ -13,14 +13,16 @@ from .Data import item_table, location_table, region_table, category_table
 from .Game import game_name, filler_item_name, starting_items
 from .Meta import world_description, world_webworld, enable_region_diagram
 from .Locations import location_id_to_name, location_name_to_id, location_name_to_location, location_name_groups, victory_names
-from .Items import item_id_to_name, item_name_to_id, item_name_to_item, item_name_groups
+from .Items import item_id_to_name, item_name_to_id, item_name_to_item, item_name_groups, category_state_keys, item_name_to_category_keys, \
+    item_name_to_values, category_name_to_item_names, get_item_names_in_categories
 from .DataValidation import runGenerationDataValidation, runPreFillDataValidation
+from .DataBundle import data_bundle, save_data_bundle
 
-from .Regions import create_regions
 from .Items import ManualItem
-from .Rules import set_rules
+from .Locations import ManualLocation
+from .ItemPool import ItemPool
 from .Options import manual_options_data
-from .Helpers import is_item_enabled, get_option_value, get_items_for_player, resolve_yaml_option, format_state_prog_items_key, ProgItemsCat
+from .Helpers import is_item_enabled, get_option_value, get_items_for_player, resolve_yaml_option, clear_state_caches
 
 from BaseClasses import CollectionState, ItemClassification, Item
 from Options import PerGameCommonOptions
@@ -29,14 +31,21 @@ from worlds.AutoWorld import World
 from .hooks.World import \
     hook_get_filler_item_name, before_create_regions, after_create_regions, \
     before_create_items_all, before_create_items_starting, before_create_items_filler, after_create_items, \
-    before_create_item, after_create_item, \
+    before_create_item, after_create_item, before_create_items_bulk, after_create_items_bulk, \
     before_set_rules, after_set_rules, \
     before_generate_basic, after_generate_basic, \
     before_fill_slot_data, after_fill_slot_data, before_write_spoiler, \
     before_extend_hint_information, after_extend_hint_information, \
-    after_collect_item, after_remove_item
+    after_collect_item, after_remove_item, hook_get_locations_affected_by_item
 from .hooks.Data import hook_interpret_slot_data
 
+if TYPE_CHECKING:
+    from .RulesProfiler import RulesProfiler
+
+# the data files are fully loaded and processed once the modules above are imported, save them so the next import can skip that
+if data_bundle is None:
+    save_data_bundle()
+
 class ManualWorld(World):
     __doc__ = world_description
     game: str = game_name
@@ -55,6 +64,10 @@ class ManualWorld(World):
     item_name_to_id = item_name_to_id
     item_name_to_item = item_name_to_item
     item_name_groups = item_name_groups
+    category_name_to_item_names = category_name_to_item_names
+    category_state_keys = category_state_keys
+    item_name_to_category_keys = item_name_to_category_keys
+    item_name_to_values = item_name_to_values
 
     filler_item_name = filler_item_name
 
@@ -68,6 +81,12 @@ class ManualWorld(World):
     location_name_groups = location_name_groups
     victory_names = victory_names
 
+    # This player's locations by name, filled by Regions.create_region as they are created.
+    # Use remove_locations to remove some so it stays in sync, and register_location for a location you create yourself.
+    # Locations a hook removes from or adds to a region directly are picked up by sync_manual_locations,
+    # which runs before every step that goes through all of them (set_rules, generate_basic and extend_hint_information).
+    manual_locations: dict[str, ManualLocation] = {}
+
     # UT (the universal-est of trackers) can now generate without a YAML
     ut_can_gen_without_yaml = False  # Temporary disable until we fix the bugs with it
 
@@ -96,22 +115,46 @@ class ManualWorld(World):
     def create_regions(self):
         before_create_regions(self, self.multiworld, self.player)
 
+        self.manual_locations = {}
+        # only imported when generating, the client and the launcher never need them
+        from .Regions import create_regions
         create_regions(self, self.multiworld, self.player)
 
-        location_game_complete = self.multiworld.get_location(victory_names[get_option_value(self.multiworld, self.player, 'goal')], self.player)
+        # the other victory locations aren't created, see Regions.get_skipped_location_names
+        location_game_complete = self.manual_locations[victory_names[get_option_value(self.multiworld, self.player, 'goal')]]
         location_game_complete.address = None
 
-        for unused_goal in [self.multiworld.get_location(name, self.player) for name in victory_names if name != location_game_complete.name]:
-            unused_goal.parent_region.locations.remove(unused_goal)
-
         location_game_complete.place_locked_item(
             ManualItem("__Victory__", ItemClassification.progression, None, player=self.player))
 
         after_create_regions(self, self.multiworld, self.player)
 
+    def register_location(self, location: ManualLocation):
+        """Add a location created outside of Regions.create_region (eg. an event) to manual_locations, after adding it to its region"""
+        self.manual_locations[location.name] = location
+
+    def remove_locations(self, location_names: Iterable[str]):
+        """Remove the named locations from their region and from manual_locations, the names of locations this player doesn't have are skipped"""
+        for name in location_names:
+            location = self.manual_locations.pop(name, None)
+            if location is not None:
+                location.parent_region.locations.remove(location)
+
+    def sync_manual_locations(self):
+        """Rebuild manual_locations from the player's regions, in case a hook removed or added locations without going through
+        remove_locations/register_location. Only the player's own regions are looked at."""
+        self.manual_locations = {location.name: location for region in self.multiworld.get_regions(self.player) for location in region.locations}
+
+    def get_location(self, location_name: str) -> ManualLocation:
+        """Returns this player's location named location_name from manual_locations, instead of looking it up in the whole multiworld"""
+        location = self.manual_locations.get(location_name)
+        if location is None:
+            return super().get_location(location_name)
+        return location
+
     def create_items(self):
         # Generate item pool
-        pool: list[Item] = []
+        pool = ItemPool()
         traps = []
         configured_item_names = self.item_id_to_name.copy()
 
@@ -138,9 +181,7 @@ class ManualWorld(World):
             total_created = 0
             if type(configs) is int:
                 total_created = configs
-                for _ in range(configs):
-                    new_item = self.create_item(name)
-                    pool.append(new_item)
+                pool.extend(self.create_items_bulk(name, configs))
             elif type(configs) is dict:
                 for cat, count in configs.items():
                     total_created += count
@@ -157,9 +198,7 @@ class ManualWorld(World):
                         except Exception as ex:
                             raise Exception(f"Item override '{cat}' for {name} improperly defined\n\n{type(ex).__name__}:{ex}")
 
-                    for _ in range(count):
-                        new_item = self.create_item(name, true_class)
-                        pool.append(new_item)
+                    pool.extend(self.create_items_bulk(name, count, true_class))
             else:
                 raise Exception(f"Item override for {name} improperly defined")
 
@@ -191,7 +230,7 @@ class ManualWorld(World):
                     raise Exception(f"Item {name}'s 'local_early' has an invalid value of '{item['local_early']}'. \nA boolean or an integer was expected.")
 
 
-        pool = before_create_items_starting(pool, self, self.multiworld, self.player)
+        pool = ItemPool.of(before_create_items_starting(pool, self, self.multiworld, self.player))
 
         items_started: list[Item] = []
 
@@ -207,34 +246,40 @@ class ManualWorld(World):
                     if len(matching_items) == 0:
                         continue
 
-                # start with the full pool of items
-                items = pool
-
                 # if the setting lists specific item names, limit the items to just those
+                names = None
                 if "items" in starting_item_block:
-                    items = [item for item in pool if item.name in starting_item_block["items"]]
+                    names = starting_item_block["items"]
 
                 # if the setting lists specific item categories, limit the items to ones that have any of those categories
                 if "item_categories" in starting_item_block:
-                    items_in_categories = [item["name"] for item in self.item_name_to_item.values() if "category" in item and len(set(starting_item_block["item_categories"]).intersection(item["category"])) > 0]
-                    items = [item for item in pool if item.name in items_in_categories]
+                    names = get_item_names_in_categories(starting_item_block["item_categories"])
+
+                # otherwise start with the full pool of items
+                items = pool.as_list() if names is None else pool.select(names)
 
-                self.random.shuffle(items)
+                if self.starting_items_rng_compatibility:
+                    self.random.shuffle(items)
+                    if names is None:
+                        # the whole pool used to be shuffled in place
+                        pool = ItemPool(items)
+                    if "random" in starting_item_block:
+                        items = items[0:starting_item_block["random"]]
 
                 # if the setting lists a specific number of random items that should be pulled, only use a subset equal to that number
-                if "random" in starting_item_block:
-                    items = items[0:starting_item_block["random"]]
+                elif "random" in starting_item_block and starting_item_block["random"] < len(items):
+                    items = self.random.sample(items, max(starting_item_block["random"], 0))
 
                 for starting_item in items:
                     items_started.append(starting_item)
                     self.multiworld.push_precollected(starting_item)
-                    pool.remove(starting_item)
+                pool.remove_all(items)
 
-        self.start_inventory = {i.name: items_started.count(i) for i in items_started}
+        self.start_inventory = dict(Counter(i.name for i in items_started))
 
-        pool = before_create_items_filler(pool, self, self.multiworld, self.player)
-        pool = self.adjust_filler_items(pool, traps)
-        pool = after_create_items(pool, self, self.multiworld, self.player)
+        pool = ItemPool.of(before_create_items_filler(pool, self, self.multiworld, self.player))
+        pool = ItemPool.of(self.adjust_filler_items(pool, traps))
+        pool = ItemPool.of(after_create_items(pool, self, self.multiworld, self.player)).as_list()
 
         # need to put all of the items in the pool so we can have a full state for placement
         # then will remove specific item placements below from the overall pool
@@ -247,23 +292,7 @@ class ManualWorld(World):
     def create_item(self, name: str, class_override: Optional['ItemClassification']=None) -> Item:
         name = before_create_item(name, self, self.multiworld, self.player)
 
-        item = self.item_name_to_item[name]
-        if class_override is not None:
-            classification = class_override
-        else:
-            classification = ItemClassification.filler
-
-            if "trap" in item and item["trap"]:
-                classification |= ItemClassification.trap
-
-            if "useful" in item and item["useful"]:
-                classification |= ItemClassification.useful
-
-            if "progression_skip_balancing" in item and item["progression_skip_balancing"]:
-                classification |= ItemClassification.progression_skip_balancing
-            elif "progression" in item and item["progression"]:
-                classification |= ItemClassification.progression
-
+        classification = class_override if class_override is not None else self.get_item_classification(name)
         item_object = ManualItem(name, classification,
                         self.item_name_to_id[name], player=self.player)
 
@@ -271,38 +300,137 @@ class ManualWorld(World):
 
         return item_object
 
-    # Item Value need a tweaked collect and remove:
+    def create_items_bulk(self, name: str, count: int, class_override: Optional['ItemClassification']=None) -> list[Item]:
+        """Create count copies of an item, like calling create_item count times, but the name, classification and id are only resolved once.
+
+        The before_create_items_bulk and after_create_items_bulk hooks are called once for all the copies instead of
+        before_create_item and after_create_item for each of them. By default they still call the per-item hooks, see hooks/World.py."""
+        if count <= 0:
+            return []
+
+        name = before_create_items_bulk(name, count, self, self.multiworld, self.player)
+
+        classification = class_override if class_override is not None else self.get_item_classification(name)
+        item_id = self.item_name_to_id[name]
+        player = self.player
+        items = [ManualItem(name, classification, item_id, player=player) for _ in range(count)]
+
+        return after_create_items_bulk(items, self, self.multiworld, self.player)
+
+    def get_item_classification(self, name: str) -> ItemClassification:
+        """Returns the classification of the item from its data, which create_item uses when it isn't given a class_override"""
+        item = self.item_name_to_item[name]
+        classification = ItemClassification.filler
+
+        if "trap" in item and item["trap"]:
+            classification |= ItemClassification.trap
+
+        if "useful" in item and item["useful"]:
+            classification |= ItemClassification.useful
+
+        if "progression_skip_balancing" in item and item["progression_skip_balancing"]:
+            classification |= ItemClassification.progression_skip_balancing
+        elif "progression" in item and item["progression"]:
+            classification |= ItemClassification.progression
+
+        return classification
+
+    # Item Value, category counts and the rule caches need a tweaked collect and remove:
     def collect(self, state: CollectionState, item: Item) -> bool:
         change = super().collect(state, item)
-        manual_item = self.item_name_to_item.get(item.name, {})
-        if change and manual_item.get("value"):
-            for key, value in manual_item["value"].items():
-                state.prog_items[item.player][format_state_prog_items_key(ProgItemsCat.VALUE, key)] += int(value)
+        if change:
+            for key, value in self.item_name_to_values.get(item.name, ()):
+                state.prog_items[item.player][key] += value
+            for key in self.item_name_to_category_keys.get(item.name, ()):
+                state.prog_items[item.player][key] += 1
+            clear_state_caches(state, item.player)
         after_collect_item(self, state, change, item)
         return change
 
     def remove(self, state: CollectionState, item: Item) -> bool:
         change = super().remove(state, item)
-        manual_item = self.item_name_to_item.get(item.name, {})
-        if change and manual_item.get("value"):
-            for key, value in manual_item["value"].items():
-                state.prog_items[item.player][format_state_prog_items_key(ProgItemsCat.VALUE, key)] -= int(value)
+        if change:
+            for key, value in self.item_name_to_values.get(item.name, ()):
+                state.prog_items[item.player][key] -= value
+            for key in self.item_name_to_category_keys.get(item.name, ()):
+                state.prog_items[item.player][key] -= 1
+            clear_state_caches(state, item.player)
         after_remove_item(self, state, change, item)
         return change
 
+    def get_locations_affected_by_item(self, item_name: str) -> set[str]:
+        """Names of this player's locations whose access could change when an item named item_name is collected or removed.\n
+        That is the locations whose requires reference the item, the ones whose requires can't be indexed,
+        and every location in a region behind an entrance whose requires reference the item."""
+        if item_name not in self.locations_affected_by_item:
+            locations = set(self.item_name_to_dependent_locations.get(item_name, ())) | self.unindexed_locations
+
+            entrance_names = self.item_name_to_dependent_entrances.get(item_name, set()) | self.unindexed_entrances
+            regions = [self.get_entrance(entrance_name).connected_region for entrance_name in entrance_names]
+            seen_regions = set()
+            while regions:
+                region = regions.pop()
+                if region is None or region in seen_regions:
+                    continue
+                seen_regions.add(region)
+                locations.update(location.name for location in region.locations)
+                regions.extend(exit.connected_region for exit in region.exits)
+
+            self.locations_affected_by_item[item_name] = hook_get_locations_affected_by_item(item_name, locations, self, self.multiworld, self.player)
+        return self.locations_affected_by_item[item_name]
+
+    def get_count_threshold_locations_met(self, state: CollectionState) -> list[str]:
+        """Names of the locations whose requires is a single |Item:N| or |@Category:N| that the state meets.\n
+        Each item/category's locations are kept sorted by N, so this is one bisect per item/category instead of a rule call per location.
+        Like an access_rule this doesn't check the location's region."""
+        locations = []
+        for thresholds in self.count_thresholds.values():
+            locations.extend(thresholds.met(state, self.player))
+        return locations
+
+    def get_location_access_results(self, state: CollectionState) -> dict[str, bool]:
+        """Whether each of this player's locations can be reached with the state, by location name.\n
+        Like location.can_reach this needs both the location's region to be reachable and its access_rule to pass.
+        Most of the access_rules are evaluated together with numpy when it's installed, see BatchRulesEvaluator."""
+        results = self.batch_rules.evaluate(state)
+        region_reachable: dict[str, bool] = {}
+        for location_name, rule_met in results.items():
+            if not rule_met:
+                continue
+            region = self.get_location(location_name).parent_region
+            if region.name not in region_reachable:
+                region_reachable[region.name] = state.can_reach_region(region.name, self.player)
+            results[location_name] = region_reachable[region.name]
+        return results
+
     def set_rules(self):
+        from .Rules import set_rules
+        from .RulesProfiler import RulesProfiler, is_profiling_enabled_by_env
+
+        self.rules_profiler = RulesProfiler() if self.rules_profile or is_profiling_enabled_by_env() else None
+
         before_set_rules(self, self.multiworld, self.player)
+        self.sync_manual_locations()
 
         set_rules(self, self.multiworld, self.player)
 
         after_set_rules(self, self.multiworld, self.player)
 
+        if self.rules_profiler:
+            self.sync_manual_locations()
+            for location in self.manual_locations.values():
+                location.access_rule = self.rules_profiler.wrap("location", location.name, location.access_rule)
+            for region in self.multiworld.get_regions(self.player):
+                for entrance in region.exits:
+                    entrance.access_rule = self.rules_profiler.wrap("entrance", entrance.name, entrance.access_rule)
+
     def generate_basic(self):
         before_generate_basic(self, self.multiworld, self.player)
+        self.sync_manual_locations()
 
         # Handle item forbidding
         manual_locations_with_forbid = {location['name']: location for location in location_name_to_location.values() if "dont_place_item" in location or "dont_place_item_category" in location}
-        locations_with_forbid = [l for l in self.multiworld.get_unfilled_locations(player=self.player) if l.name in manual_locations_with_forbid.keys()]
+        locations_with_forbid = [l for l in self.manual_locations.values() if l.item is None and l.name in manual_locations_with_forbid]
         for location in locations_with_forbid:
             manual_location = manual_locations_with_forbid[location.name]
             forbidden_item_names = []
@@ -311,14 +439,14 @@ class ManualWorld(World):
                 forbidden_item_names.extend([i["name"] for i in item_name_to_item.values() if i["name"] in manual_location["dont_place_item"]])
 
             if manual_location.get("dont_place_item_category"):
-                forbidden_item_names.extend([i["name"] for i in item_name_to_item.values() if "category" in i and set(i["category"]).intersection(manual_location["dont_place_item_category"])])
+                forbidden_item_names.extend(get_item_names_in_categories(manual_location["dont_place_item_category"]))
 
             if forbidden_item_names:
                 forbid_items_for_player(location, set(forbidden_item_names), self.player)
 
         # Handle specific item placements using fill_restrictive
         manual_locations_with_placements = {location['name']: location for location in location_name_to_location.values() if "place_item" in location or "place_item_category" in location}
-        locations_with_placements = [l for l in self.multiworld.get_unfilled_locations(player=self.player) if l.name in manual_locations_with_placements.keys()]
+        locations_with_placements = [l for l in self.manual_locations.values() if l.item is None and l.name in manual_locations_with_placements]
         for location in locations_with_placements:
             manual_location = manual_locations_with_placements[location.name]
             eligible_items = []
@@ -333,7 +461,7 @@ class ManualWorld(World):
                 place_messages.append('", "'.join(manual_location["place_item"]))
 
             if manual_location.get("place_item_category"):
-                eligible_item_names += [i["name"] for i in item_name_to_item.values() if "category" in i and set(i["category"]).intersection(manual_location["place_item_category"])]
+                eligible_item_names += get_item_names_in_categories(manual_location["place_item_category"])
                 place_messages.append('", "'.join(manual_location["place_item_category"]) + " category(ies)")
 
             # Second we check for forbidden items names
@@ -342,7 +470,7 @@ class ManualWorld(World):
                 forbid_messages.append('", "'.join(manual_location["dont_place_item"]) + ' items')
 
             if manual_location.get("dont_place_item_category"):
-                forbidden_item_names += [i["name"] for i in item_name_to_item.values() if "category" in i and set(i["category"]).intersection(manual_location["dont_place_item_category"])]
+                forbidden_item_names += get_item_names_in_categories(manual_location["dont_place_item_category"])
                 forbid_messages.append('", "'.join(manual_location["dont_place_item_category"]) + ' category(ies)')
 
             # If we forbid some names, check for those in the possible names and remove them
@@ -396,13 +524,19 @@ class ManualWorld(World):
         with open(os.path.join(output_directory, filename), 'wb') as f:
             f.write(b64encode(bytes(json.dumps(data), 'utf-8')))
 
+        if self.rules_profiler:
+            filename = f"{self.multiworld.get_out_file_name_base(self.player)}_rules_profile.txt"
+            self.rules_profiler.write_report(os.path.join(output_directory, filename),
+                                             f"Rules profile of {self.multiworld.get_player_name(self.player)} ({self.game})")
+
     def write_spoiler(self, spoiler_handle):
         before_write_spoiler(self, self.multiworld, spoiler_handle)
 
     def extend_hint_information(self, hint_data: dict[int, dict[int, str]]) -> None:
         before_extend_hint_information(hint_data, self, self.multiworld, self.player)
+        self.sync_manual_locations()
 
-        for location in self.multiworld.get_locations(self.player):
+        for location in self.manual_locations.values():
             if not location.address:
                 continue
             if "hint_entrance" in self.location_name_to_location[location.name]:
@@ -416,17 +550,56 @@ class ManualWorld(World):
     # Non-standard AP world methods
     ###
 
+    starting_items_rng_compatibility: bool = False
+    """Default: False\n
+    Pick the random starting items of the starting_items blocks the way older versions did, by shuffling every matching item of the pool
+    (and the whole pool itself when a block has no items/item_categories), so a seed starts with the same items as it did with them.\n
+    When False, only the random items that are needed are sampled from the matching items."""
+
     rules_functions_maximum_recursion: int = 5
     """Default: 5\n
     The maximum time a location/region's requirement can loop to check for functions\n
     One thing to remember is the more you loop the longer generation will take. So probably leave it as is unless you really needs it."""
 
+    rules_compile_requires: bool = True
+    """Default: True\n
+    Compile every location/region's string requires into a rule once in set_rules, instead of re-parsing the string on every access check.\n
+    Requires the compiler can't handle are still interpreted like before. Set this to False to interpret every requires."""
+
+    requires_parse_cache: dict = {}
+    """Default: {} (filled by set_rules)\n
+    The parsed requires strings, by their text. It's shared by every player of the game, so with several players
+    each requires is only parsed once and every player's set_rules only folds its own options into it and binds its player."""
+
+    rules_locations_check_region: bool = False
+    """Default: False\n
+    Also check the requires of a location's region in the location's own rule.\n
+    The entrances into a region already check its requires, so by default a location's rule only checks the location's requires
+    and leaves the region to the region graph. When this is True, the region results are cached on the state until the player's items change."""
+
+    rules_extract_common_requires: int = 0
+    """Default: 0 (off)\n
+    When set to a number, the and/or parts of the requires that at least that many locations share are each turned into an event
+    (a locked location and item in the Manual region), and the locations' rules only check for that event.
+    Sweeps then evaluate each shared part once instead of once per location, at the cost of the locations' rules
+    only being right in a state that was swept for events. How many evaluations this saves is logged.
+    Only compiled requires are changed, and only the parts that getting more items can't make False."""
+    common_requires_events: dict[str, list[str]] = {}
+
+    rules_profile: bool = False
+    """Default: False\n
+    Count the calls, results and time spent in every location and entrance rule, along with the functions they call,
+    and write a report sorted by time next to the other output files. Setting the MANUAL_PROFILE_RULES environment variable does the same.\n
+    This slows generation down a bit, only turn it on to find which requires are expensive."""
+    rules_profiler: Optional["RulesProfiler"] = None
+
     def add_filler_items(self, item_pool, traps):
         Utils.deprecate("Use adjust_filler_items instead.")
         return self.adjust_filler_items(item_pool, traps)
 
     def adjust_filler_items(self, item_pool, traps):
-        extras = len(self.multiworld.get_unfilled_locations(player=self.player)) - len(item_pool)
+        item_pool = ItemPool.of(item_pool)
+        extras = self.get_unfilled_location_count() - len(item_pool)
 
         if extras > 0:
             trap_percent = get_option_value(self.multiworld, self.player, "filler_traps")
@@ -448,35 +621,50 @@ class ManualWorld(World):
             # Filler is only assigned if the item doesn't have any other tags, so it only has to be covered by itself.
             # Skip Balancing is also not covered due to how it's only supported when paired with Progression.
             # As a result, these cover every possible combination can be removed.
-            fillers = [item for item in item_pool if item.classification == ItemClassification.filler]
-            traps = [item for item in item_pool if item.classification == ItemClassification.trap]
-            useful = [item for item in item_pool if item.classification == ItemClassification.useful]
+            fillers = []
+            traps = []
+            useful = []
             # Useful + Trap is classified separately so that it can have a unique priority ranking.
-            useful_traps = [item for item in item_pool if
-                            ItemClassification.progression not in item.classification
-                            and ItemClassification.useful in item.classification
-                            and ItemClassification.trap in item.classification]
+            useful_traps = []
+            for item in item_pool:
+                if item.classification == ItemClassification.filler:
+                    fillers.append(item)
+                elif item.classification == ItemClassification.trap:
+                    traps.append(item)
+                elif item.classification == ItemClassification.useful:
+                    useful.append(item)
+                elif ItemClassification.progression not in item.classification \
+                        and ItemClassification.useful in item.classification \
+                        and ItemClassification.trap in item.classification:
+                    useful_traps.append(item)
             self.random.shuffle(fillers)
             self.random.shuffle(traps)
             self.random.shuffle(useful)
             self.random.shuffle(useful_traps)
+            removed = []
             for _ in range(0, abs(extras)):
-                popped = None
                 if fillers:
-                    popped = fillers.pop()
+                    removed.append(fillers.pop())
                 elif traps:
-                    popped = traps.pop()
+                    removed.append(traps.pop())
                 elif useful:
-                    popped = useful.pop()
+                    removed.append(useful.pop())
                 elif useful_traps:
-                    popped = useful_traps.pop()
+                    removed.append(useful_traps.pop())
                 else:
                     logging.warning("Could not remove enough non-progression items from the pool.")
                     break
-                item_pool.remove(popped)
+            # removed by name in one go, the first items in the pool with those names are the ones removed like list.remove did
+            item_pool.remove_all(removed)
 
         return item_pool
 
+    def get_unfilled_location_count(self) -> int:
+        """Returns how many of the player's locations don't have an item yet.\n
+        Only the player's own regions are looked at, without building the list of locations like multiworld.get_unfilled_locations does.
+        It doesn't rely on manual_locations since hooks (eg. before_create_items_starting) may have removed locations from their region directly."""
+        return sum(location.item is None for region in self.multiworld.get_regions(self.player) for location in region.locations)
+
     def get_item_counts(self, player: Optional[int] = None, pool: list[Item] | None | bool = None, only_progression: bool = False) -> Counter[str]:
         """Returns the player real item counts.\n
         If you provide an item pool using the pool argument, then it's item counts will be returned.
@@ -505,8 +693,8 @@ class ManualWorld(World):
             "game": self.game,
             'player_name': self.multiworld.get_player_name(self.player),
             'player_id': self.player,
-            'items': self.item_name_to_item,
-            'locations': self.location_name_to_location,
+            'items': {name: dict(item) for name, item in self.item_name_to_item.items()},
+            'locations': {name: dict(location) for name, location in self.location_name_to_location.items()},
             # todo: extract connections out of multiworld.get_regions() instead, in case hooks have modified the regions.
             'regions': region_table,
             'categories': category_table
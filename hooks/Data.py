@@ -23,12 +23,13 @@ def after_load_location_file(location_table: list) -> list:
     location["category"] = ["((~Objective~))"]
     location["requires"] = "|@Trophies:1|"
     location_table.append(location)
-    for i in range(2, trophies_in_pool + 1):
-        location = {}
-        location["name"] = f"Gather {i} Trophies"
-        location["category"] = ["((~Objective~))"]
-        location["requires"] = f"|@Trophies:{i}|"
-        location_table.append(location)
+    # a location family, one "Gather N Trophies" location for each N from 2 to trophies_in_pool
+    location = {}
+    location["name"] = "Gather {count} Trophies"
+    location["template"] = {"count": [2, trophies_in_pool]}
+    location["category"] = ["((~Objective~))"]
+    location["requires"] = "|@Trophies:{count}|"
+    location_table.append(location)
 
     location = {}
     location["name"] = "Goal (Gather 1 Trophy)"
@@ -36,13 +37,13 @@ def after_load_location_file(location_table: list) -> list:
     location["requires"] = "|@Trophies:1|"
     location["victory"] = True
     location_table.append(location)
-    for i in range(2, trophies_in_pool + 1):
-        location = {}
-        location["name"] = f"Goal (Gather {i} Trophies)"
-        location["category"] = ["((~Goal~))"]
-        location["requires"] = f"|@Trophies:{i}|"
-        location["victory"] = True
-        location_table.append(location)
+    location = {}
+    location["name"] = "Goal (Gather {count} Trophies)"
+    location["template"] = {"count": [2, trophies_in_pool]}
+    location["category"] = ["((~Goal~))"]
+    location["requires"] = "|@Trophies:{count}|"
+    location["victory"] = True
+    location_table.append(location)
 
     csvFile = csv.DictReader(pkgutil.get_data(__name__, "locations.csv").decode().splitlines(), delimiter=';')
     for line in csvFile:
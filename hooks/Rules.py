@@ -1,6 +1,6 @@
 from typing import Optional
 from worlds.AutoWorld import World
-from ..Helpers import clamp, get_items_with_value, get_option_value, is_category_enabled
+from ..Helpers import clamp, get_items_with_value, get_option_value, is_category_enabled, state_independent
 from BaseClasses import MultiWorld, CollectionState
 
 import re
@@ -28,7 +28,10 @@ def requiresMelee():
     """Returns a requires string that checks if the player has unlocked the tank."""
     return "|Figher Level:15| or |Black Belt Level:15| or |Thief Level:15|"
 
+# If a function's result only depends on the options and not on the state, mark it with @state_independent.
+# It will then only be called once per player when the rules are set, instead of on every access check.
 # Rule for is category enabled
+@state_independent
 def CupItemsEnabled(world: World, multiworld: MultiWorld, state: CollectionState, player: int) -> bool:
     """Is a category option enabled?"""
     if get_option_value(multiworld, player, "cups_unlock_method") == 1: # Cups Items
@@ -42,6 +45,7 @@ def CupItemsEnabled(world: World, multiworld: MultiWorld, state: CollectionState
     #return is_category_enabled(multiworld, player, param)
 
 # Rule for is category disabled
+@state_independent
 def CupItemsDisabled(world: World, multiworld: MultiWorld, state: CollectionState, player: int) -> bool:
     """Is a category option disabled?"""
     if get_option_value(multiworld, player, "cups_unlock_method") == 1: # Cups Items
@@ -53,6 +57,7 @@ def CupItemsDisabled(world: World, multiworld: MultiWorld, state: CollectionStat
     else:
         return not False
 
+@state_independent
 def random_characters_enabled(world: World, multiworld: MultiWorld, state: CollectionState, player: int) -> bool:
     """Is Random Characters enabled?"""
     if get_option_value(multiworld, player, "random_characters") == 1: # Random Characters
@@ -1,6 +1,8 @@
 import math
+from collections import Counter
+from typing import Optional
 
-from .functions import get_battle_list, get_cup_list, get_max_trophies, get_track_list, num_difficulties, trophies_in_pool, debug
+from .functions import get_battle_list, get_cup_list, get_max_trophies, get_goal_trophies, get_track_list, num_difficulties, trophies_in_pool, debug
 
 # Object classes from AP core, to represent an entire MultiWorld and this individual World that's part of it
 from worlds.AutoWorld import World
@@ -9,6 +11,7 @@ from BaseClasses import MultiWorld, CollectionState, Item
 # Object classes from Manual -- extending AP core -- representing items and locations that are used in generation
 from ..Items import ManualItem
 from ..Locations import ManualLocation
+from ..ItemPool import ItemPool
 
 # Raw JSON data from the Manual apworld, respectively:
 #          data/game.json, data/items.json, data/locations.json, data/regions.json
@@ -45,9 +48,7 @@ def before_create_regions(world: World, multiworld: MultiWorld, player: int):
     # Get goal location index
     if get_option_value(multiworld, player, "goal_type") == 0:
         # Get the number of trophies needed to win
-        max_trophies = get_max_trophies(multiworld, player)
-        multiplier = get_option_value(multiworld, player, "percentage_trophies")
-        trophies = max(round(max_trophies * multiplier / 100), 1)
+        trophies = get_goal_trophies(multiworld, player)
         if trophies == 1:
             goal_index = world.victory_names.index(f"Goal (Gather 1 Trophy)")
         else:
@@ -59,6 +60,18 @@ def before_create_regions(world: World, multiworld: MultiWorld, player: int):
     # Set goal location
     world.options.goal.value = goal_index
 
+# Called by create_regions for each location family (a location with a "template", see Locations.py), before creating its locations.
+# Return the indexes of the family's locations to create for this player, or None to create all of them (the default).
+# Only the goal is created out of the victory locations, whatever this returns.
+def hook_get_location_family_indexes(family_name: str, world: World, multiworld: MultiWorld, player: int) -> Optional[set[int]]:
+    if family_name == "Gather {count} Trophies":
+        # Without the Final Challenge these are disabled, with it only the one for the goal's trophies is kept (see before_create_items_starting)
+        if get_option_value(multiworld, player, "goal_type") == 0:
+            return set()
+        if not hasattr(multiworld, "generation_is_fake"):
+            return {get_goal_trophies(multiworld, player)}
+    return None
+
 # Called after regions and locations are created, in case you want to see or modify that information. Victory location is included.
 def after_create_regions(world: World, multiworld: MultiWorld, player: int):
     # Use this hook to remove locations from the world
@@ -66,11 +79,7 @@ def after_create_regions(world: World, multiworld: MultiWorld, player: int):
 
     # Add your code here to calculate which locations to remove
     
-    for region in multiworld.regions:
-        if region.player == player:
-            for location in list(region.locations):
-                if location.name in locationNamesToRemove:
-                    region.locations.remove(location)
+    world.remove_locations(locationNamesToRemove)
 
 # This hook allows you to access the item names & counts before the items are created. Use this to increase/decrease the amount of a specific item in the pool
 # Valid item_config key/values:
@@ -98,7 +107,7 @@ def before_create_items_all(item_config: dict[str, int|dict], world: World, mult
     return item_config
 
 # The item pool before starting items are processed, in case you want to see the raw item pool at that stage
-def before_create_items_starting(item_pool: list, world: World, multiworld: MultiWorld, player: int) -> list:
+def before_create_items_starting(item_pool: ItemPool, world: World, multiworld: MultiWorld, player: int) -> ItemPool:
     itemNamesToRemove = [] # List of item names
 
     nf = is_category_enabled(multiworld, player, "NF")
@@ -150,8 +159,7 @@ def before_create_items_starting(item_pool: list, world: World, multiworld: Mult
     for _ in range(num_starting_tracks):
         strack = world.random.choice(list(starting_list))
         print(strack)
-        item = next(i for i in item_pool if i.name == strack)
-        item_pool.remove(item)
+        item = item_pool.take(strack)
         multiworld.push_precollected(item)
         if strack in track_list:
             track_list.remove(strack)
@@ -165,7 +173,7 @@ def before_create_items_starting(item_pool: list, world: World, multiworld: Mult
     if debug:
         print(f"Max Trophies: {max_trophies}")
     multiplier = get_option_value(multiworld, player, "percentage_trophies")
-    trophies = max(round(max_trophies * multiplier / 100), 1)
+    trophies = get_goal_trophies(multiworld, player)
     if debug:
         print(f"Trophies: {trophies} ({multiplier}% of {max_trophies})")
     
@@ -175,8 +183,7 @@ def before_create_items_starting(item_pool: list, world: World, multiworld: Mult
     if not hasattr(world.multiworld, "generation_is_fake"):
         if final_challenge:
             # Get the victory item out of the pool:
-            victory_item = next(i for i in item_pool if i.name == "Ultimate Trophy (Victory)")
-            item_pool.remove(victory_item)
+            victory_item = item_pool.take("Ultimate Trophy (Victory)")
             # Get the victory location and place the victory item there
             gather_loc_list = ["Gather 1 Trophy"] # A list of all the victory location names in order
             for i in range(2, trophies_in_pool + 1):
@@ -188,7 +195,7 @@ def before_create_items_starting(item_pool: list, world: World, multiworld: Mult
                     break
 
             gather_location_name = gather_loc_list[victory_id]
-            gather_location = next(l for l in multiworld.get_unfilled_locations(player=player) if l.name == gather_location_name)
+            gather_location = world.get_location(gather_location_name)
             final_track_location_name = ""
 
             # get the final track/cup name, add the unneeded locations to the gather_loc_list for deletion
@@ -230,9 +237,8 @@ def before_create_items_starting(item_pool: list, world: World, multiworld: Mult
                 
             # assign Ultimate Trophy item and final track item to the final track and gather locations respectively
             final_track_location_name = gather_loc_list[-1]
-            final_track_location = next(l for l in multiworld.get_unfilled_locations(player=player) if l.name == final_track_location_name)
-            final_track_item = next(i for i in item_pool if i.name == final_track_name)
-            item_pool.remove(final_track_item)
+            final_track_location = world.get_location(final_track_location_name)
+            final_track_item = item_pool.take(final_track_name)
 
             gather_location.place_locked_item(final_track_item)
             final_track_location.place_locked_item(victory_item)
@@ -256,26 +262,20 @@ def before_create_items_starting(item_pool: list, world: World, multiworld: Mult
                 gather_loc_list.append("Win a Battle as Zem")
 
     # Remove the extra gather locations and unneeded final track locations
-    for region in multiworld.regions:
-        if region.player == player:
-            for location in list(region.locations):
-                if location.name in gather_loc_list and location.name != gather_location_name and location.name != final_track_location_name:
-                    region.locations.remove(location)
-                    pass
+    world.remove_locations(name for name in gather_loc_list if name != gather_location_name and name != final_track_location_name)
 
     # Remove items from the pool
     if debug:
         print("Removing items from pool:")
-    trophy_count = 0
-    for itemName in itemNamesToRemove:
-        if debug:
+        trophy_count = 0
+        for itemName in itemNamesToRemove:
             if itemName == "Trophy":
                 trophy_count += 1
                 print(itemName, "=", trophy_count)
             else:
                 print(itemName)
-        item = next(i for i in item_pool if i.name == itemName)
-        item_pool.remove(item)
+    for itemName, count in Counter(itemNamesToRemove).items():
+        item_pool.remove_n(itemName, count)
     
     if debug:
         numTrophies = 0
@@ -295,7 +295,7 @@ def before_create_items_starting(item_pool: list, world: World, multiworld: Mult
     return item_pool
 
 # The item pool after starting items are processed but before filler is added, in case you want to see the raw item pool at that stage
-def before_create_items_filler(item_pool: list, world: World, multiworld: MultiWorld, player: int) -> list:
+def before_create_items_filler(item_pool: ItemPool, world: World, multiworld: MultiWorld, player: int) -> ItemPool:
     # Use this hook to remove items from the item pool
     itemNamesToRemove: list[str] = [] # List of item names
 
@@ -304,22 +304,20 @@ def before_create_items_filler(item_pool: list, world: World, multiworld: MultiW
     # Because multiple copies of an item can exist, you need to add an item name
     # to the list multiple times if you want to remove multiple copies of it.
 
-    for itemName in itemNamesToRemove:
-        item = next(i for i in item_pool if i.name == itemName)
-        item_pool.remove(item)
+    for itemName, count in Counter(itemNamesToRemove).items():
+        item_pool.remove_n(itemName, count)
 
     return item_pool
 
     # Some other useful hook options:
 
     ## Place an item at a specific location
-    # location = next(l for l in multiworld.get_unfilled_locations(player=player) if l.name == "Location Name")
-    # item_to_place = next(i for i in item_pool if i.name == "Item Name")
+    # location = world.get_location("Location Name")
+    # item_to_place = item_pool.take("Item Name")
     # location.place_locked_item(item_to_place)
-    # item_pool.remove(item_to_place)
 
 # The complete item pool prior to being set for generation is provided here, in case you want to make changes to it
-def after_create_items(item_pool: list, world: World, multiworld: MultiWorld, player: int) -> list:
+def after_create_items(item_pool: ItemPool, world: World, multiworld: MultiWorld, player: int) -> ItemPool:
     return item_pool
 
 # Called before rules for accessing regions and locations are created. Not clear why you'd want this, but it's here.
@@ -332,7 +330,7 @@ def after_set_rules(world: World, multiworld: MultiWorld, player: int):
     pass
 
     ## Common functions:
-    # location = world.get_location(location_name, player)
+    # location = world.get_location(location_name)
     # location.access_rule = Example_Rule
 
     ## Combine rules:
@@ -349,6 +347,17 @@ def before_create_item(item_name: str, world: World, multiworld: MultiWorld, pla
 def after_create_item(item: ManualItem, world: World, multiworld: MultiWorld, player: int) -> ManualItem:
     return item
 
+# create_items makes all the copies of an item at once with world.create_items_bulk, which calls these two hooks once per item name.
+# By default they call before_create_item once for the name and after_create_item for each copy, like create_item does.
+# If your item hooks don't need to see every copy, do their work here instead so each item name only costs one call.
+# The item name to create and how many copies of it are provided before the items are created, in case you want to make changes to the name
+def before_create_items_bulk(item_name: str, count: int, world: World, multiworld: MultiWorld, player: int) -> str:
+    return before_create_item(item_name, world, multiworld, player)
+
+# The copies of the item that were created are provided after creation, in case you want to modify them
+def after_create_items_bulk(items: list[ManualItem], world: World, multiworld: MultiWorld, player: int) -> list[ManualItem]:
+    return [after_create_item(item, world, multiworld, player) for item in items]
+
 # This method is run towards the end of pre-generation, before the place_item options have been handled and before AP generation occurs
 def before_generate_basic(world: World, multiworld: MultiWorld, player: int):
     pass
@@ -373,6 +382,12 @@ def after_remove_item(world: World, state: CollectionState, Changed: bool, item:
     #     state.prog_items[item.player][format_state_prog_items_key(ProgItemsCat.VALUE, "Potato")] -= 1
     pass
 
+# This is called with the names of the locations whose access could change when the item is collected or removed,
+# as found by ManualWorld.get_locations_affected_by_item from the requires. If you set other rules yourself (eg. in after_set_rules)
+# add the locations they could affect here
+def hook_get_locations_affected_by_item(item_name: str, locations: set[str], world: World, multiworld: MultiWorld, player: int) -> set[str]:
+    return locations
+
 
 # This is called before slot data is set and provides an empty dict ({}), in case you want to modify it before Manual does
 def before_fill_slot_data(slot_data: dict, world: World, multiworld: MultiWorld, player: int) -> dict:
@@ -392,7 +407,7 @@ def before_extend_hint_information(hint_data: dict[int, dict[int, str]], world:
     ### Example way to use this hook:
     # if player not in hint_data:
     #     hint_data.update({player: {}})
-    # for location in multiworld.get_locations(player):
+    # for location in world.manual_locations.values():
     #     if not location.address:
     #         continue
     #
@@ -173,3 +173,9 @@ def get_max_trophies(multiworld: MultiWorld, player: int):
         max_trophies = max(round(totalLocations * 8 / 9 - totalItems), 1)
 
     return max_trophies
+
+def get_goal_trophies(multiworld: MultiWorld, player: int):
+    # The number of trophies to gather, for the trophy goal or before the Final Challenge
+    max_trophies = get_max_trophies(multiworld, player)
+    multiplier = get_option_value(multiworld, player, "percentage_trophies")
+    return max(round(max_trophies * multiplier / 100), 1)
@@ -0,0 +1,134 @@
+"""Benchmarks for this Manual world, run from the root of an Archipelago install with:
+    python -m worlds.<this world's folder>.manual_benchmark
+"""
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from BaseClasses import CollectionState, MultiWorld
+from test.general import setup_multiworld, setup_solo_multiworld
+from worlds.AutoWorld import call_all
+
+from . import ManualWorld
+from .DataBundle import BUNDLE_ENV_VAR
+from .Records import ManualRecord
+
+
+def _time_location_rules(multiworld: MultiWorld, states: list[CollectionState], repeat: int) -> float:
+    locations = multiworld.get_locations(1)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for state in states:
+            for location in locations:
+                location.access_rule(state)
+    return time.perf_counter() - start
+
+def benchmark_rules_compiler(seed: int = 1, repeat: int = 20) -> None:
+    """Evaluate every location's access rule against an empty and a full state, once with the requires interpreted and once compiled."""
+    results = {}
+    for compiled in (False, True):
+        ManualWorld.rules_compile_requires = compiled
+        try:
+            multiworld = setup_solo_multiworld(ManualWorld, seed=seed)
+        finally:
+            ManualWorld.rules_compile_requires = True
+
+        states = [CollectionState(multiworld), multiworld.get_all_state(False)]
+        results[compiled] = _time_location_rules(multiworld, states, repeat)
+
+        location_count = len(multiworld.get_locations(1))
+        print(f"{'compiled' if compiled else 'interpreted'}: {results[compiled]:.3f}s for {repeat * len(states) * location_count} rule calls")
+
+    print(f"speedup: {results[False] / results[True]:.1f}x")
+
+def _time_import(bundle: bool) -> float:
+    """Import every world in a new process and return how long importing this one took, in seconds"""
+    env = dict(os.environ, **{BUNDLE_ENV_VAR: "1" if bundle else "0"})
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import worlds"], env=env, capture_output=True, text=True, check=True)
+    # each line is "import time: self [us] | cumulative | imported package"
+    for line in result.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip() == __package__:
+            return int(parts[1]) / 1_000_000
+    raise RuntimeError(f"{__package__} wasn't imported")
+
+def benchmark_import(repeat: int = 5) -> None:
+    """Time importing this world with the data files loaded and processed like usual, then with the data bundle, the best of repeat imports each."""
+    _time_import(True) # makes sure the bundle is saved and up to date
+    results = {bundle: min(_time_import(bundle) for _ in range(repeat)) for bundle in (False, True)}
+
+    print(f"import without bundle: {results[False] * 1000:.1f}ms")
+    print(f"import with bundle: {results[True] * 1000:.1f}ms")
+    print(f"speedup: {results[False] / results[True]:.1f}x")
+
+def _as_dicts(table: list[ManualRecord]) -> list[dict]:
+    """The table the way it was before records, one dict per entry with its own category list"""
+    return [{**entry, "category": list(entry["category"])} if "category" in entry else dict(entry) for entry in table]
+
+def _measure_memory(build) -> tuple[object, int]:
+    tracemalloc.start()
+    try:
+        result = build()
+        return result, tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+def _time_access(table: list, access, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for entry in table:
+            access(entry)
+    return time.perf_counter() - start
+
+def benchmark_records(repeat: int = 200) -> None:
+    """Compare the memory used by the item and location tables as dicts and as records, and how fast their keys are read."""
+    for table_name in ("item_table", "location_table"):
+        records = getattr(ManualWorld, table_name)
+        dicts, dicts_memory = _measure_memory(lambda: _as_dicts(records))
+        copies, records_memory = _measure_memory(lambda: [type(record)(record) for record in records])
+        print(f"{table_name} ({len(records)} entries): {dicts_memory / 1024:.0f}KiB as dicts, {records_memory / 1024:.0f}KiB as records")
+
+        accesses = {
+            'entry["name"]': lambda entry: entry["name"],
+            'entry.get("category", [])': lambda entry: entry.get("category", []),
+            '"requires" in entry': lambda entry: "requires" in entry,
+        }
+        for description, access in accesses.items():
+            dicts_time = _time_access(dicts, access, repeat)
+            records_time = _time_access(copies, access, repeat)
+            print(f"    {description}: {dicts_time * 1000:.1f}ms with dicts, {records_time * 1000:.1f}ms with records")
+        print(f"    entry.name: {_time_access(copies, lambda entry: entry.name, repeat) * 1000:.1f}ms with records")
+
+def benchmark_create_items(players: int = 50, seed: int = 1, repeat: int = 20) -> None:
+    """Count every player's unfilled locations with multiworld.get_unfilled_locations and with get_unfilled_location_count,
+    then time create_items for a multiworld of players slots of this world."""
+    multiworld = setup_multiworld([ManualWorld] * players, ("generate_early", "create_regions"), seed)
+    worlds = list(multiworld.worlds.values())
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for world in worlds:
+            len(multiworld.get_unfilled_locations(player=world.player))
+    unfilled_locations_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for world in worlds:
+            world.get_unfilled_location_count()
+    unfilled_count_time = time.perf_counter() - start
+
+    print(f"unfilled locations of {players} players x{repeat}: {unfilled_locations_time * 1000:.1f}ms with get_unfilled_locations, "
+          f"{unfilled_count_time * 1000:.1f}ms with get_unfilled_location_count")
+
+    start = time.perf_counter()
+    call_all(multiworld, "create_items")
+    print(f"create_items for {players} players: {(time.perf_counter() - start) * 1000:.1f}ms, {len(multiworld.itempool)} items")
+
+
+if __name__ == "__main__":
+    benchmark_rules_compiler()
+    benchmark_import()
+    benchmark_records()
+    benchmark_create_items()
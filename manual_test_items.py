@@ -0,0 +1,126 @@
+import random
+import unittest
+
+from BaseClasses import Item, ItemClassification
+
+from .Helpers import format_state_prog_items_key, ProgItemsCat
+from .ItemPool import ItemPool
+from .Items import item_name_to_item, item_name_to_values
+from .Records import ItemRecord
+
+
+def _first_named(items: list[Item], name: str) -> Item:
+    return next(item for item in items if item.name == name)
+
+
+class ItemPoolTest(unittest.TestCase):
+    """Every ItemPool operation must leave the same items, in the same order, as the list operations it replaced"""
+    names = ["Trophy", "Crash Cove", "Zam", "Zem"]
+    classifications = [ItemClassification.filler, ItemClassification.useful, ItemClassification.progression]
+
+    def _items(self, rng: random.Random, count: int) -> list[Item]:
+        return [Item(rng.choice(self.names), rng.choice(self.classifications), None, 1) for _ in range(count)]
+
+    def assertSamePool(self, pool: ItemPool, items: list[Item]):
+        self.assertEqual(len(pool), len(items))
+        self.assertTrue(all(a is b for a, b in zip(pool, items)))
+        for name in self.names:
+            self.assertEqual(pool.count(name), sum(item.name == name for item in items))
+
+    def test_take_and_remove_n(self):
+        rng = random.Random(1)
+        items = self._items(rng, 300)
+        pool = ItemPool(items)
+        for _ in range(100):
+            name = rng.choice(self.names)
+            if not any(item.name == name for item in items):
+                self.assertRaises(ValueError, pool.take, name)
+                continue
+            expected = _first_named(items, name)
+            items.remove(expected)
+            self.assertIs(pool.take(name), expected)
+            self.assertSamePool(pool, items)
+
+            count = rng.randrange(5)
+            if sum(item.name == name for item in items) < count:
+                self.assertRaises(ValueError, pool.remove_n, name, count)
+            else:
+                for _ in range(count):
+                    items.remove(_first_named(items, name))
+                pool.remove_n(name, count)
+            self.assertSamePool(pool, items)
+
+    def test_take_by_classification(self):
+        rng = random.Random(2)
+        items = self._items(rng, 100)
+        pool = ItemPool(items)
+        for name in self.names:
+            for classification in self.classifications:
+                matching = [item for item in items if item.name == name and item.classification == classification]
+                if matching:
+                    # list.remove would take the first item with the same name, whatever its classification
+                    del items[next(i for i, item in enumerate(items) if item is matching[0])]
+                    self.assertIs(pool.take(name, classification), matching[0])
+        self.assertSamePool(pool, items)
+
+    def test_remove_all(self):
+        rng = random.Random(3)
+        items = self._items(rng, 300)
+        pool = ItemPool(items)
+        removed = rng.sample(items, 120)
+        for item in removed:
+            items.remove(item)
+        pool.remove_all(removed)
+        self.assertSamePool(pool, items)
+        self.assertRaises(ValueError, pool.remove_all, [Item("Not In The Pool", ItemClassification.filler, None, 1)])
+        self.assertSamePool(pool, items)
+
+    def test_list_operations(self):
+        rng = random.Random(4)
+        items = self._items(rng, 200)
+        pool = ItemPool(items)
+        for seed in range(20):
+            random.Random(seed).shuffle(pool)
+            random.Random(seed).shuffle(items)
+            self.assertIs(pool.pop(), items.pop())
+            self.assertIs(pool.pop(3), items.pop(3))
+            extra = self._items(rng, 2)
+            pool += extra
+            items += extra
+            pool.insert(5, extra[0])
+            items.insert(5, extra[0])
+            del pool[7]
+            del items[7]
+            name = rng.choice(self.names)
+            items.remove(_first_named(items, name))
+            pool.take(name)
+            self.assertSamePool(pool, items)
+        pool[:] = items[::-1]
+        items.reverse()
+        self.assertSamePool(pool, items)
+
+
+class ItemRecordTest(unittest.TestCase):
+    def test_records_are_read_only(self):
+        record = next(iter(item_name_to_item.values()))
+        self.assertIsInstance(record, ItemRecord)
+        with self.assertRaises(TypeError):
+            record["name"] = "Changed"
+        with self.assertRaises(AttributeError):
+            record.name = "Changed"
+
+    def test_records_read_like_dicts(self):
+        for record in item_name_to_item.values():
+            copy = dict(record)
+            self.assertEqual(copy, {key: record[key] for key in record})
+            self.assertEqual(record.get("category", []), copy.get("category", []))
+            self.assertEqual(ItemRecord(copy), record)
+
+    def test_values_match_records(self):
+        expected = {}
+        for record in item_name_to_item.values():
+            self.assertNotEqual(record.get("value"), {})
+            if record.get("value"):
+                expected[record["name"]] = tuple((format_state_prog_items_key(ProgItemsCat.VALUE, key), int(value))
+                                                 for key, value in record["value"].items())
+        self.assertEqual(item_name_to_values, expected)
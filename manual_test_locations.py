@@ -0,0 +1,48 @@
+import unittest
+
+from .Data import location_table
+from .Locations import expand_location_template, location_families, location_name_to_id
+
+
+class LocationTemplateTest(unittest.TestCase):
+    def test_expansion_matches_written_out_locations(self):
+        template = {"id": 50, "name": "Gather {count} Gems", "region": "Gem Cups", "category": ["Gems", "{count} Gems"],
+                    "requires": "|Gem:{count}|", "template": {"count": [2, 4]}}
+        written_out = [
+            {"id": 50, "name": "Gather 2 Gems", "region": "Gem Cups", "category": ["Gems", "2 Gems"], "requires": "|Gem:2|"},
+            {"name": "Gather 3 Gems", "region": "Gem Cups", "category": ["Gems", "3 Gems"], "requires": "|Gem:3|"},
+            {"name": "Gather 4 Gems", "region": "Gem Cups", "category": ["Gems", "4 Gems"], "requires": "|Gem:4|"},
+        ]
+        self.assertEqual(expand_location_template(template), written_out)
+
+        location = {"name": "Crash Cove", "requires": []}
+        self.assertEqual(expand_location_template(location), [location])
+
+    def test_expansion_fills_dict_form_requires(self):
+        template = {"name": "Gather {count} Relics", "requires": ["|Relic:{count}|", {"or": ["|Gem:{count}|", "|Token:{count}|"]}],
+                    "template": {"count": [1, 2]}}
+        written_out = [
+            {"name": "Gather 1 Relics", "requires": ["|Relic:1|", {"or": ["|Gem:1|", "|Token:1|"]}]},
+            {"name": "Gather 2 Relics", "requires": ["|Relic:2|", {"or": ["|Gem:2|", "|Token:2|"]}]},
+        ]
+        self.assertEqual(expand_location_template(template), written_out)
+
+    def test_families_get_the_ids_of_written_out_locations(self):
+        """The members of a family are in the location table in order, with consecutive ids following the location before them,
+        which are the ids they had when they were written out one by one in the data"""
+        names = [location["name"] for location in location_table]
+        for family_name, members in location_families.items():
+            with self.subTest(family=family_name):
+                ordered = sorted(members, key=members.get)
+                first = names.index(ordered[0])
+                self.assertEqual(names[first:first + len(ordered)], ordered)
+
+                ids = [location_name_to_id[name] for name in ordered]
+                self.assertEqual(ids, list(range(ids[0], ids[0] + len(ids))))
+                if first > 0:
+                    self.assertGreater(ids[0], location_name_to_id[names[first - 1]])
+                if first + len(ordered) < len(names):
+                    self.assertEqual(location_name_to_id[names[first + len(ordered)]], ids[-1] + 1)
+
+    def test_ids_are_unique(self):
+        self.assertEqual(len(set(location_name_to_id.values())), len(location_name_to_id))
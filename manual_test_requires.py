@@ -0,0 +1,52 @@
+import random
+import unittest
+from typing import Iterator
+
+from BaseClasses import CollectionState, MultiWorld
+from test.general import setup_solo_multiworld
+
+from . import ManualWorld
+
+
+def random_item_names(multiworld: MultiWorld, seed: int, count: int) -> Iterator[list[str]]:
+    """count random parts of the player's item pool, from empty to almost full"""
+    rng = random.Random(seed)
+    item_names = [item.name for item in multiworld.itempool if item.player == 1]
+    for i in range(count):
+        share = i / count
+        yield [name for name in item_names if rng.random() < share]
+
+def collect_state(multiworld: MultiWorld, item_names: list[str]) -> CollectionState:
+    state = CollectionState(multiworld)
+    world = multiworld.worlds[1]
+    for name in item_names:
+        state.collect(world.create_item(name), True)
+    return state
+
+
+class RequiresCompilerTest(unittest.TestCase):
+    """The compiled requires must give the same answer as the interpreter for any state"""
+    seed = 1
+    states = 50
+
+    @classmethod
+    def setUpClass(cls):
+        ManualWorld.rules_compile_requires = False
+        try:
+            cls.interpreted = setup_solo_multiworld(ManualWorld, seed=cls.seed)
+        finally:
+            ManualWorld.rules_compile_requires = True
+        cls.compiled = setup_solo_multiworld(ManualWorld, seed=cls.seed)
+
+    def test_compiled_rules_match_interpreted_rules(self):
+        interpreted_locations = {location.name: location for location in self.interpreted.get_locations(1)}
+        compiled_locations = {location.name: location for location in self.compiled.get_locations(1)}
+        names = interpreted_locations.keys() & compiled_locations.keys()
+        self.assertTrue(names)
+
+        for item_names in random_item_names(self.compiled, self.seed, self.states):
+            interpreted_state, compiled_state = collect_state(self.interpreted, item_names), collect_state(self.compiled, item_names)
+            for name in names:
+                with self.subTest(location=name):
+                    self.assertEqual(interpreted_locations[name].access_rule(interpreted_state),
+                                     compiled_locations[name].access_rule(compiled_state))
@@ -0,0 +1,71 @@
+import unittest
+
+from test.general import setup_solo_multiworld
+
+from . import ManualWorld
+from .manual_test_requires import collect_state, random_item_names
+
+
+class CountThresholdsTest(unittest.TestCase):
+    """The locations the count thresholds say are met must be the ones whose rule passes"""
+    seed = 1
+    states = 50
+
+    @classmethod
+    def setUpClass(cls):
+        cls.multiworld = setup_solo_multiworld(ManualWorld, seed=cls.seed)
+
+    def test_count_thresholds_match_rules(self):
+        world = self.multiworld.worlds[1]
+        threshold_locations = {name for thresholds in world.count_thresholds.values() for name in thresholds.location_names}
+        locations = {location.name: location for location in self.multiworld.get_locations(1)}
+
+        for item_names in random_item_names(self.multiworld, self.seed, self.states):
+            state = collect_state(self.multiworld, item_names)
+            met = set(world.get_count_threshold_locations_met(state))
+            expected = {name for name in threshold_locations if name in locations and locations[name].access_rule(state)}
+            self.assertEqual(met & locations.keys(), expected)
+
+
+class LocationAccessResultsTest(unittest.TestCase):
+    """get_location_access_results must agree with location.can_reach, whether a location is batched or not"""
+    seed = 1
+    states = 50
+
+    @classmethod
+    def setUpClass(cls):
+        cls.multiworld = setup_solo_multiworld(ManualWorld, seed=cls.seed)
+
+    def test_location_access_results_match_can_reach(self):
+        world = self.multiworld.worlds[1]
+        locations = self.multiworld.get_locations(1)
+        for item_names in random_item_names(self.multiworld, self.seed, self.states):
+            state = collect_state(self.multiworld, item_names)
+            results = world.get_location_access_results(state)
+            self.assertEqual(results, {location.name: bool(location.can_reach(state)) for location in locations})
+
+        # no location can be reached through a region that can't be, whatever its own access_rule says
+        entrances = self.multiworld.get_region("Manual", 1).entrances
+        access_rules = [entrance.access_rule for entrance in entrances]
+        try:
+            for entrance in entrances:
+                entrance.access_rule = lambda state: False
+            for item_names in random_item_names(self.multiworld, self.seed, self.states):
+                self.assertFalse(any(world.get_location_access_results(collect_state(self.multiworld, item_names)).values()))
+        finally:
+            for entrance, access_rule in zip(entrances, access_rules):
+                entrance.access_rule = access_rule
+
+    def test_location_access_results_follow_replaced_rules(self):
+        world = self.multiworld.worlds[1]
+        state = collect_state(self.multiworld, [item.name for item in self.multiworld.itempool if item.player == 1])
+        results = world.get_location_access_results(state)
+        location = next(location for location in self.multiworld.get_locations(1) if results[location.name])
+
+        access_rule = location.access_rule
+        try:
+            location.access_rule = lambda state: False
+            self.assertFalse(world.get_location_access_results(state)[location.name])
+        finally:
+            location.access_rule = access_rule
+        self.assertTrue(world.get_location_access_results(state)[location.name])